@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文本提取后端对比基准
+
+对同一批PDF依次运行每个提取后端，报告 页/秒、峰值RSS，
+以及各字段提取结果与 pdfplumber 基准的一致率。
+
+用法（在 backend 目录下）:
+    python benchmarks/bench_extract_backends.py 样刊1.pdf 样刊2.pdf [--prefilter]
+
+每个后端在独立子进程中运行，峰值RSS互不干扰。
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import resource
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from services.pdf_parser import EXTRACTION_BACKENDS, DEFAULT_BACKEND, open_document, _build_record
+
+# 参与比对的字段，对应 extract_* 系列函数的输出
+FIELDS = ['start_page', 'doi', 'manuscript_id', 'title', 'authors', 'first_author',
+          'corresponding', 'issue', 'is_dhu']
+
+def run_worker(backend, pdf_paths, prefilter):
+    """子进程：提取所有页面文本并逐页计算字段，输出JSON到stdout"""
+    logging.disable(logging.CRITICAL)
+    pages = 0
+    elapsed = 0.0
+    results = {}
+    for pdf_path in pdf_paths:
+        start = time.perf_counter()
+        doc = open_document(pdf_path, backend)
+        per_page = []
+        try:
+            for pi in range(doc.n_pages):
+                if prefilter and not doc.may_have_doi(pi):
+                    per_page.append(None)
+                    continue
+                record = _build_record(doc.page_text(pi), pdf_path, doc.n_pages)
+                doc.release(pi)
+                per_page.append({k: record[k] for k in FIELDS} if record else None)
+        finally:
+            doc.close()
+        elapsed += time.perf_counter() - start
+        pages += len(per_page)
+        results[pdf_path] = per_page
+
+    json.dump({
+        'pages': pages,
+        'seconds': elapsed,
+        'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'results': results,
+    }, sys.stdout)
+
+def run_backend(backend, pdf_paths, prefilter):
+    cmd = [sys.executable, os.path.abspath(__file__), '--worker', backend] + pdf_paths
+    if prefilter:
+        cmd.append('--prefilter')
+    out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+    return json.loads(out)
+
+def compare(baseline, other):
+    """逐页比对：以基准识别出的文章首页为准统计各字段一致率，并统计漏检/误检页数"""
+    matched = {k: 0 for k in FIELDS}
+    total = missed = extra = 0
+    for pdf_path, base_pages in baseline['results'].items():
+        for base, cand in zip(base_pages, other['results'][pdf_path]):
+            if base is None:
+                if cand is not None:
+                    extra += 1
+                continue
+            total += 1
+            if cand is None:
+                missed += 1
+                continue
+            for k in FIELDS:
+                if base[k] == cand[k]:
+                    matched[k] += 1
+    agreement = {k: (matched[k] / total if total else 1.0) for k in FIELDS}
+    return agreement, total, missed, extra
+
+def main():
+    parser = argparse.ArgumentParser(description='文本提取后端对比基准')
+    parser.add_argument('pdfs', nargs='+', help='样刊PDF路径')
+    parser.add_argument('--prefilter', action='store_true', help='启用内容流预筛选')
+    parser.add_argument('--backends', default=','.join(EXTRACTION_BACKENDS),
+                        help='逗号分隔的后端列表')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.pdfs, args.prefilter)
+        return
+
+    backends = [b for b in args.backends.split(',') if b]
+    if DEFAULT_BACKEND not in backends:
+        backends.insert(0, DEFAULT_BACKEND)
+
+    runs = {}
+    for backend in backends:
+        print(f"运行后端 {backend} ...", file=sys.stderr)
+        runs[backend] = run_backend(backend, args.pdfs, args.prefilter)
+
+    baseline = runs[DEFAULT_BACKEND]
+    print(f"{'后端':<12}{'页/秒':>10}{'峰值RSS(MB)':>14}{'文章页':>8}{'漏检':>6}{'误检':>6}  字段一致率")
+    for backend, run in runs.items():
+        agreement, total, missed, extra = compare(baseline, run)
+        rate = run['pages'] / run['seconds'] if run['seconds'] else float('inf')
+        # Linux 下 ru_maxrss 单位为KB
+        rss_mb = run['max_rss_kb'] / 1024
+        fields = ' '.join(f"{k}={v:.0%}" for k, v in agreement.items())
+        print(f"{backend:<12}{rate:>10.1f}{rss_mb:>14.1f}{total:>8}{missed:>6}{extra:>6}  {fields}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+日志开销基准：1000 篇论文的统计表导出在不同日志配置下的耗时
+
+- 逐行INFO：重构前的写法（导出接口每篇论文一条 f-string INFO，生成器再构造整份 debug_data 输出一次）
+- INFO：默认配置，逐行日志关闭，不构造任何消息
+- DEBUG 采样：LOG_DEBUG=export，每 100 行输出一条
+- DEBUG 全量：LOG_DEBUG=export，LOG_ROW_SAMPLE=1
+
+日志写入临时文件，包含真实的格式化和I/O开销。
+
+用法（在 backend 目录下）:
+    python benchmarks/bench_logging.py [--papers 1000] [--repeat 5]
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from services.log_utils import configure_logging
+from services.document_generator import generate_excel_stats, _stats_values
+
+class FakeJournal:
+    id = 1
+    issue = '2025, 42(3)'
+
+def make_articles(n):
+    return [{
+        'manuscript_id': f'E2024-{i:05d}',
+        'pdf_pages': 200,
+        'first_author': f'AUTHOR{i} Name',
+        'corresponding': f'AUTHOR{i + 1} Name',
+        'issue': '2025, 42(3)',
+        'is_dhu': i % 2 == 0,
+    } for i in range(n)]
+
+def export_legacy(articles, journal, path):
+    """重构前的日志写法：逐篇 INFO + 整份 debug_data"""
+    logger = logging.getLogger('app')
+    built = []
+    for article in articles:
+        built.append(article)
+        logger.info(f"论文数据: manuscript_id={article['manuscript_id']}, pdf_pages={article['pdf_pages']}, first_author={article['first_author']}, corresponding={article['corresponding']}, issue={article['issue']}, is_dhu={article['is_dhu']}")
+    generate_excel_stats(built, journal, path)
+    debug_data = [_stats_values(a) for a in built]
+    logging.getLogger('services.document_generator').info(f"生成的数据: {debug_data}")
+
+def export_current(articles, journal, path):
+    generate_excel_stats(list(articles), journal, path)
+
+def configure(log_path, debug_subsystems=(), row_sample_every=100):
+    for name in ('app', 'services.document_generator'):
+        logging.getLogger(name).setLevel(logging.NOTSET)
+    configure_logging('INFO', 'text', debug_subsystems, row_sample_every)
+    handler = logging.getLogger().handlers[0]
+    handler.setStream(open(log_path, 'a', encoding='utf-8'))
+
+def main():
+    parser = argparse.ArgumentParser(description='日志开销基准')
+    parser.add_argument('--papers', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    log_path = os.path.join(tmpdir, 'bench.log')
+    out_path = os.path.join(tmpdir, 'stats.xlsx')
+    articles = make_articles(args.papers)
+    journal = FakeJournal()
+
+    cases = [
+        ('逐行INFO（重构前）', export_legacy, {}),
+        ('INFO（默认）', export_current, {}),
+        ('DEBUG 采样1/100', export_current, {'debug_subsystems': ['export'], 'row_sample_every': 100}),
+        ('DEBUG 全量', export_current, {'debug_subsystems': ['export'], 'row_sample_every': 1}),
+    ]
+    print(f"{args.papers} 篇论文统计表导出，取 {args.repeat} 次最好成绩")
+    for name, fn, options in cases:
+        configure(log_path, **options)
+        size_before = os.path.getsize(log_path) if os.path.exists(log_path) else 0
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            fn(articles, journal, out_path)
+            best = min(best, time.perf_counter() - start)
+        logged = (os.path.getsize(log_path) - size_before) // args.repeat
+        print(f"{name:<20}{best * 1000:>10.1f} ms  日志 {logged:>9} 字节/次")
+
+if __name__ == '__main__':
+    main()
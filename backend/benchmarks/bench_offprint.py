@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+抽印本拆分基准：合成一期大PDF（默认200篇×5页=1000页），分别用
+- naive:    按路径打开（PdfReader 把整个文件读入内存），单个 reader 依次写出全部抽印本，
+            已解析对象一直缓存
+- 分组拆分: services.offprint.split_offprints，文件流按需读取，每篇写完即丢弃为它解析出的对象
+统计耗时和峰值内存（每种方式在独立子进程中运行，峰值取子进程及其工作进程的最大RSS），
+并核对每篇抽印本的页数与文章边界一致、总页数等于源文件页数。
+
+用法（在 backend 目录下）:
+    python benchmarks/bench_offprint.py [--articles 200] [--pages-per-article 5] [--figure-kb 100] [--workers 4]
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import resource
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from synthetic_journal import generate_issue
+
+def run_naive(pdf_path, page_indexes, out_dir):
+    from PyPDF2 import PdfReader, PdfWriter
+    from services.offprint import article_ranges
+    reader = PdfReader(pdf_path)
+    pages = []
+    for k, (start, stop) in enumerate(article_ranges(page_indexes, len(reader.pages))):
+        writer = PdfWriter()
+        for pi in range(start, stop):
+            writer.add_page(reader.pages[pi])
+        with open(os.path.join(out_dir, f'{k:04d}.pdf'), 'wb') as f:
+            writer.write(f)
+        pages.append(stop - start)
+    return pages
+
+def run_split(pdf_path, page_indexes, out_dir, workers, chunk_pages):
+    from services.offprint import split_offprints
+    out_paths = [os.path.join(out_dir, f'{k:04d}.pdf') for k in range(len(page_indexes))]
+    return split_offprints(pdf_path, page_indexes, out_paths, workers=workers, chunk_pages=chunk_pages)
+
+def child(args):
+    """子进程：执行一种拆分方式，输出 JSON 结果"""
+    logging.disable(logging.CRITICAL)
+    page_indexes = json.loads(args.page_indexes)
+    out_dir = tempfile.mkdtemp(dir=args.work)
+    start = time.perf_counter()
+    if args.mode == 'naive':
+        pages = run_naive(args.pdf, page_indexes, out_dir)
+    else:
+        pages = run_split(args.pdf, page_indexes, out_dir, args.workers, args.chunk_pages)
+    elapsed = time.perf_counter() - start
+    peak_kb = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                  resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    print(json.dumps({'seconds': elapsed, 'peak_mb': peak_kb / 1024, 'pages': pages}))
+
+def main():
+    parser = argparse.ArgumentParser(description='抽印本拆分基准')
+    parser.add_argument('--articles', type=int, default=200)
+    parser.add_argument('--pages-per-article', type=int, default=5)
+    parser.add_argument('--figure-kb', type=int, default=100, help='每个正文页嵌入的图片大小')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-pages', type=int, default=64)
+    # 以下为子进程内部参数
+    parser.add_argument('--mode', help=argparse.SUPPRESS)
+    parser.add_argument('--pdf', help=argparse.SUPPRESS)
+    parser.add_argument('--work', help=argparse.SUPPRESS)
+    parser.add_argument('--page-indexes', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mode == 'generate':
+        generate_issue(args.pdf, articles=args.articles, pages_per_article=args.pages_per_article,
+                       figure_kb=args.figure_kb)
+        return
+    if args.mode:
+        child(args)
+        return
+
+    # 生成也放在子进程中：ru_maxrss 会跨 fork/exec 继承，父进程不能先占用大量内存
+    work = tempfile.mkdtemp()
+    pdf_path = os.path.join(work, 'issue.pdf')
+    subprocess.run([sys.executable, os.path.abspath(__file__), '--mode', 'generate', '--pdf', pdf_path,
+                    '--articles', str(args.articles), '--pages-per-article', str(args.pages_per_article),
+                    '--figure-kb', str(args.figure_kb)], check=True)
+    n_pages = args.articles * args.pages_per_article
+    page_indexes = [k * args.pages_per_article for k in range(args.articles)]
+    print(f"源文件: {n_pages} 页, {os.path.getsize(pdf_path) / 1024 / 1024:.1f} MB, {args.articles} 篇")
+
+    modes = [('naive（整体读入，单进程）', 'naive', 1), ('分组拆分，串行', 'split', 1),
+             (f'分组拆分，{args.workers} 进程', 'split', args.workers)]
+    print(f"{'方式':<24}{'耗时(s)':>10}{'峰值内存(MB)':>14}")
+    for label, mode, workers in modes:
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--mode', mode, '--pdf', pdf_path, '--work', work,
+             '--workers', str(workers), '--chunk-pages', str(args.chunk_pages),
+             '--page-indexes', json.dumps(page_indexes)],
+            check=True, capture_output=True, text=True).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        assert result['pages'] == [args.pages_per_article] * args.articles, f"{label}: 抽印本页数不一致"
+        assert sum(result['pages']) == n_pages
+        print(f"{label:<24}{result['seconds']:>10.2f}{result['peak_mb']:>14.1f}")
+    print("页数核对通过：每篇抽印本页数与文章边界一致，合计等于源文件页数")
+
+if __name__ == '__main__':
+    main()
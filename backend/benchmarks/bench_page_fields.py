@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+单遍提取引擎 extract_page_fields 与参考实现 extract_* 系列函数的对比
+
+1. 黄金比对：对每一页文本逐字段比较两种实现的输出，任一不一致即以非零状态退出；
+2. 微基准：在同一批文本上分别重复运行，报告每页耗时和加速比。
+
+用法（在 backend 目录下）:
+    python benchmarks/bench_page_fields.py [样刊1.pdf ...] [--repeat 200]
+
+不给PDF时只使用内置的边界用例文本。
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from services.pdf_parser import (
+    open_document, extract_page_fields, extract_start_page, extract_doi, extract_title_authors,
+    normalize_authors_for_display, first_author_from_authors, extract_issue_info,
+    extract_corresponding, doi_to_manuscript_id,
+)
+
+# 覆盖冒号行、星号、多空格作者行、中文机构、无DOI行等分支的内置用例
+BUILTIN_PAGES = [
+    "Journal of Donghua University   Vol. 42 No. 3 2025   101\nDOI: 10.19884/j.1672-5220.202405007\n"
+    "Study of Things\nin Textiles\nHUANG Jiacui∗  ZHAO Mingbo\nCollege of Textiles, Donghua University\n"
+    "Correspondence should be addressed to ZHAO Mingbo, E-mail: x@dhu.edu.cn",
+    "\n\n 205 \nDOI\n：\n10.1/abc\n:\nA Title Line\n：\nSecond Line\nLI Wei, WANG Fang, ZHANG\n东华大学\n"
+    "Vol.7 No.12 1999\nCorrespondence  should be addressed to wang fang；more",
+    "header\nno page here\nDOI 10.1234/x.y.123456789\nOnly Title\n",
+    "Some preface DOI text without number\n" + "\n".join(f"line {i}" for i in range(20)),
+    "DOI: 10.5/q\nTitle\nAuthor*One   Author*Two   Three\nCorrespondence should be addressed to Nobody Else",
+    "DOI:10.5/q\n\n   \nT\n",
+]
+
+def legacy_fields(text):
+    """按重构前 parse_pdf_to_papers 的调用方式组合参考实现"""
+    start_page = extract_start_page(text)
+    doi = extract_doi(text)
+    title, authors_line = extract_title_authors(text)
+    authors_display = normalize_authors_for_display(authors_line) if authors_line else ""
+    first_author = first_author_from_authors(authors_line) if authors_line else ""
+    return {
+        "start_page": start_page,
+        "doi": doi,
+        "manuscript_id": doi_to_manuscript_id(doi),
+        "title": title,
+        "authors": authors_display,
+        "first_author": first_author,
+        "corresponding": extract_corresponding(text, authors_display),
+        "issue": extract_issue_info(text),
+        "is_dhu": "donghua university" in text.lower() or "东华大学" in text,
+    }
+
+def load_pages(pdf_paths):
+    pages = list(BUILTIN_PAGES)
+    for pdf_path in pdf_paths:
+        doc = open_document(pdf_path)
+        try:
+            for pi in range(doc.n_pages):
+                text = doc.page_text(pi)
+                doc.release(pi)
+                if "DOI" in text:
+                    pages.append(text)
+        finally:
+            doc.close()
+    return pages
+
+def time_per_page(fn, pages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in pages:
+            fn(text)
+    return (time.perf_counter() - start) / (repeat * len(pages))
+
+def main():
+    parser = argparse.ArgumentParser(description='单遍提取引擎黄金比对与微基准')
+    parser.add_argument('pdfs', nargs='*', help='样刊PDF路径')
+    parser.add_argument('--repeat', type=int, default=200, help='每种实现重复运行的轮数')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    pages = load_pages(args.pdfs)
+
+    mismatches = 0
+    for idx, text in enumerate(pages):
+        expected, actual = legacy_fields(text), extract_page_fields(text)
+        if expected != actual:
+            mismatches += 1
+            diff = {k: (expected[k], actual[k]) for k in expected if expected[k] != actual.get(k)}
+            print(f"第 {idx} 页不一致: {diff}")
+    print(f"黄金比对: {len(pages)} 页, 不一致 {mismatches} 页")
+
+    legacy = time_per_page(legacy_fields, pages, args.repeat)
+    engine = time_per_page(extract_page_fields, pages, args.repeat)
+    print(f"参考实现: {legacy * 1e6:.1f} µs/页")
+    print(f"单遍引擎: {engine * 1e6:.1f} µs/页  (加速 {legacy / engine:.2f}x)")
+
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+论文入库基准：逐条 ORM add 与批量多行INSERT（含作者表填充）的耗时对比，
+以及按DOI upsert 在首次导入、原样重新导入、部分修正后重新导入时的耗时和写入条数
+
+用法（在 backend 目录下）:
+    python benchmarks/bench_paper_insert.py [--papers 10000] [--db sqlite:///bench.db]
+
+默认使用临时 SQLite 文件；传入 MySQL 连接串可在真实数据库上测试（会在该库中建表并写入数据）。
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from flask import Flask
+
+from models import db, User, Journal, Paper
+from services.paper_store import bulk_insert_papers, paper_row, upsert_papers
+
+def make_records(n):
+    """构造与 parse_pdf_to_papers 输出结构一致的记录，作者在一个较小的姓名池中重复出现"""
+    records = []
+    for i in range(n):
+        authors = [f"AUTHOR{(i * 7 + k) % 3000} Name" for k in range(3)]
+        records.append({
+            'title': f'Synthetic Paper {i}',
+            'authors': ', '.join(authors),
+            'abstract': '解析出的摘要信息...',
+            'keywords': '解析出的关键词...',
+            'doi': f'10.19884/j.1672-5220.{202400000 + i}',
+            'page_start': 100 + i,
+            'page_end': 104 + i,
+            'manuscript_id': f'E2024-{i:05d}',
+            'pdf_pages': 200,
+            'first_author': authors[0],
+            'corresponding': authors[1],
+            'issue': '2025, 42(3)',
+            'is_dhu': i % 2 == 0,
+        })
+    return records
+
+def reset_schema():
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+    user = User(username='bench', password_hash='x')
+    db.session.add(user)
+    db.session.flush()
+    journal = Journal(title='东华学报', issue='基准', created_by=user.id)
+    db.session.add(journal)
+    db.session.commit()
+    return journal
+
+def run_orm(journal, records):
+    """重构前 upload_file 的写法：每条记录一个 Paper 对象，统一提交"""
+    for record in records:
+        db.session.add(Paper(**paper_row(journal, record, 'bench.pdf')))
+    db.session.commit()
+
+def run_bulk(journal, records, batch_size, with_authors):
+    bulk_insert_papers(db.session, journal, records, 'bench.pdf',
+                       batch_size=batch_size, with_authors=with_authors)
+    db.session.commit()
+
+def run_upsert(journal, records, batch_size):
+    result = upsert_papers(db.session, journal, records, 'bench.pdf', batch_size=batch_size)
+    db.session.commit()
+    return f"新增 {result['inserted']} / 更新 {result['updated']} / 未变 {result['unchanged']}"
+
+def corrected(records, every=10):
+    """模拟修正版PDF：每 every 篇中改一篇的标题"""
+    return [dict(r, title=r['title'] + ' (corrected)') if i % every == 0 else r for i, r in enumerate(records)]
+
+def main():
+    parser = argparse.ArgumentParser(description='论文入库基准')
+    parser.add_argument('--papers', type=int, default=10000)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--db', help='SQLAlchemy 连接串，默认临时 SQLite 文件')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    tmpdir = tempfile.mkdtemp()
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = args.db or f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+
+    records = make_records(args.papers)
+    cases = [
+        ('ORM逐条add', lambda j: run_orm(j, records)),
+        ('批量INSERT', lambda j: run_bulk(j, records, args.batch_size, False)),
+        ('批量INSERT+作者表', lambda j: run_bulk(j, records, args.batch_size, True)),
+    ]
+    with app.app_context():
+        print(f"{args.papers} 篇论文, 数据库: {db.engine.url.render_as_string(hide_password=True)}")
+        for name, fn in cases:
+            journal = reset_schema()
+            start = time.perf_counter()
+            fn(journal)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<16}{elapsed:>8.2f} s  {args.papers / elapsed:>10.0f} 行/秒")
+
+        # upsert：同一期依次首次导入、原样重新导入、10%修正后重新导入
+        journal = reset_schema()
+        for name, batch in (('upsert首次导入', records), ('upsert原样重导', records),
+                            ('upsert修正10%', corrected(records))):
+            start = time.perf_counter()
+            summary = run_upsert(journal, batch, args.batch_size)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<16}{elapsed:>8.2f} s  {args.papers / elapsed:>10.0f} 行/秒  {summary}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+上传 → 解析 → 入库 → 导出 全流程基准
+
+用合成期刊PDF驱动 Flask 测试客户端（SQLite 临时库，每个规模重建一次，解析在请求内同步执行），
+对每个规模分别报告：
+- 上传端到端耗时（保存、解析、入库、提交）
+- 解析吞吐（页/秒）
+- 入库吞吐（行/秒）：按DOI upsert 的新增、重复导入（内容未变）、修正版（全部更新）三种情况
+- 导出延迟（内存直出的目录/统计表、落盘导出的冷/热缓存）
+- 解析准确率（与生成器给出的期望字段比对）
+
+用法（在 backend 目录下）:
+    python benchmarks/bench_pipeline.py [--sizes 10,100,1000] [--pages-per-article 4]
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_journal import generate_issue
+
+CHECK_FIELDS = ('doi', 'manuscript_id', 'title', 'authors', 'first_author', 'corresponding', 'issue', 'is_dhu')
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def run_size(app_module, client, workdir, articles, pages_per_article):
+    from services.pdf_parser import parse_pdf_to_papers
+    from services.paper_store import upsert_papers
+    app, db, Journal, Paper = app_module.app, app_module.db, app_module.Journal, app_module.Paper
+
+    pdf_path = os.path.join(workdir, f"synthetic_{articles}.pdf")
+    expected = generate_issue(pdf_path, articles, pages_per_article, seed=articles)
+    n_pages = articles * pages_per_article
+
+    # 端到端上传（同步解析模式）
+    with open(pdf_path, 'rb') as f:
+        response, upload_s = timed(lambda: client.post(
+            '/api/upload', data={'file': (f, os.path.basename(pdf_path))},
+            content_type='multipart/form-data'))
+    journal_id = response.get_json()['journalId']
+
+    with app.app_context():
+        rows = Paper.query.filter_by(journal_id=journal_id).order_by(Paper.page_start, Paper.id).all()
+        got = [{k: getattr(r, k) for k in CHECK_FIELDS} for r in rows]
+    mismatched = sum(1 for e, g in zip(expected, got) if any(e[k] != g[k] for k in CHECK_FIELDS))
+    mismatched += abs(len(expected) - len(got))
+
+    # 只测解析
+    records, parse_s = timed(lambda: parse_pdf_to_papers(
+        pdf_path, journal_id,
+        workers=app.config['PDF_PARSE_WORKERS'],
+        chunk_size=app.config['PDF_PARSE_CHUNK_SIZE'],
+        prefilter=app.config['PDF_PREFILTER'],
+        backend=app.config['PDF_TEXT_BACKEND']))
+
+    # 只测入库：按DOI upsert 到一个新期刊（换一组DOI以免命中上传时写入的论文），
+    # 依次为全部新增、原样重复导入（全部未变，不产生写入）、修正版（标题都改过，全部更新）
+    records = [dict(r, doi=f"{r['doi']}.bench") for r in records]
+    revised = [dict(r, title=f"{r['title']} Revised") for r in records]
+    with app.app_context():
+        journal = Journal(title='东华学报', issue=f'基准{articles}', created_by=1)
+        db.session.add(journal)
+        db.session.commit()
+
+        def upsert(batch, expect):
+            written = upsert_papers(db.session, journal, batch, pdf_path,
+                                    batch_size=app.config['PAPER_INSERT_BATCH_SIZE'])
+            db.session.commit()
+            assert written[expect] == len(batch), written
+        _, insert_s = timed(lambda: upsert(records, 'inserted'))
+        _, unchanged_s = timed(lambda: upsert(records, 'unchanged'))
+        _, update_s = timed(lambda: upsert(revised, 'updated'))
+
+    # 导出延迟
+    _, toc_stream_s = timed(lambda: client.get(f'/api/export/toc/{journal_id}'))
+    _, excel_stream_s = timed(lambda: client.get(f'/api/export/excel/{journal_id}'))
+    _, toc_cold_s = timed(lambda: client.post('/api/export/toc', json={'journalId': journal_id}))
+    _, toc_warm_s = timed(lambda: client.post('/api/export/toc', json={'journalId': journal_id}))
+
+    return {
+        'articles': articles,
+        'pages': n_pages,
+        'upload_s': upload_s,
+        'parse_pps': n_pages / parse_s,
+        'insert_rps': len(records) / insert_s if insert_s else float('inf'),
+        'unchanged_rps': len(records) / unchanged_s if unchanged_s else float('inf'),
+        'update_rps': len(records) / update_s if update_s else float('inf'),
+        'toc_stream_ms': toc_stream_s * 1000,
+        'excel_stream_ms': excel_stream_s * 1000,
+        'toc_cold_ms': toc_cold_s * 1000,
+        'toc_warm_ms': toc_warm_s * 1000,
+        'mismatched': mismatched,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='上传-解析-导出全流程基准')
+    parser.add_argument('--sizes', default='10,100,1000', help='逗号分隔的每期文章数')
+    parser.add_argument('--pages-per-article', type=int, default=4)
+    args = parser.parse_args()
+
+    # 应用使用相对路径保存上传文件和缓存，切到临时目录运行，避免污染工作区
+    workdir = tempfile.mkdtemp(prefix='journal_bench_')
+    os.chdir(workdir)
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ['PARSE_ASYNC'] = '0'
+
+    import app as app_module
+    logging.disable(logging.CRITICAL)
+    client = app_module.app.test_client()
+
+    print(f"工作目录: {workdir}")
+    print(f"{'文章数':>6}{'页数':>7}{'上传(s)':>9}{'解析(页/s)':>12}{'新增(行/s)':>12}{'未变(行/s)':>12}{'更新(行/s)':>12}"
+          f"{'目录直出(ms)':>14}{'统计表直出(ms)':>16}{'目录冷(ms)':>12}{'目录热(ms)':>12}{'不一致':>8}")
+    for size in [int(s) for s in args.sizes.split(',') if s]:
+        # 每个规模用空库：各规模的合成刊DOI可能重叠，上一规模的论文会被当作已有论文更新
+        with app_module.app.app_context():
+            app_module.db.drop_all()
+        app_module.init_db()
+        r = run_size(app_module, client, workdir, size, args.pages_per_article)
+        print(f"{r['articles']:>6}{r['pages']:>7}{r['upload_s']:>9.2f}{r['parse_pps']:>12.1f}"
+              f"{r['insert_rps']:>12.0f}{r['unchanged_rps']:>12.0f}{r['update_rps']:>12.0f}{r['toc_stream_ms']:>14.1f}{r['excel_stream_ms']:>16.1f}"
+              f"{r['toc_cold_ms']:>12.1f}{r['toc_warm_ms']:>12.1f}{r['mismatched']:>8}")
+
+if __name__ == '__main__':
+    main()
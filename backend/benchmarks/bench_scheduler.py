@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CPU调度基准：模拟几位编辑同时上传整期PDF（批量解析，各用一个进程池），
+期间不断有编辑点"下载统计表"（交互式导出），另有一个线程每 50ms 做一次健康检查式的轻量请求。
+分别在不调度（每个任务到了就跑）和 CpuScheduler 调度下运行，报告：
+- 交互式导出延迟 p50 / p95 和其中等待计算槽的时间
+- 轻量请求延迟 p50 / p95 / 最大
+- 批量解析总耗时
+
+用法（在 backend 目录下）:
+    python benchmarks/bench_scheduler.py [--uploads 3] [--articles 60] [--parse-workers 2] [--exports 20]
+"""
+
+import os
+import sys
+import io
+import time
+import logging
+import argparse
+import tempfile
+import threading
+from contextlib import nullcontext
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from synthetic_journal import generate_issue
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+def run(mode, pdf_paths, args):
+    from services.pdf_parser import iter_pdf_papers
+    from services.document_generator import write_excel_stats
+    from services.scheduler import CpuScheduler, INTERACTIVE, BULK
+
+    slots = args.slots or os.cpu_count() or 1
+    scheduler = CpuScheduler(slots, {INTERACTIVE: 0, BULK: 0},
+                             interactive_reserved=1 if slots > 1 else 0) if mode == 'scheduled' else None
+    articles = [{'manuscript_id': f'M{i:05d}', 'pdf_pages': 4, 'first_author': '张三', 'corresponding': '李四',
+                 'issue': '第1期', 'is_dhu': i % 2 == 0} for i in range(args.export_rows)]
+    export_latency, export_wait, probe_latency = [], [], []
+    stop = threading.Event()
+
+    def slot(job_class, cost):
+        if scheduler is None:
+            return nullcontext(cost), None
+        ticket = scheduler.admit(job_class)
+        return scheduler.run(ticket, cost), ticket
+
+    def upload(path):
+        ctx, ticket = slot(BULK, args.parse_workers)
+        with ctx as workers:
+            for _ in iter_pdf_papers(path, workers=min(args.parse_workers, workers)):
+                pass
+        if ticket:
+            scheduler.finish(ticket)
+
+    def exports():
+        for _ in range(args.exports):
+            start = time.perf_counter()
+            ctx, ticket = slot(INTERACTIVE, 1)
+            with ctx:
+                write_excel_stats(iter(articles), io.BytesIO())
+            if ticket:
+                scheduler.finish(ticket)
+                export_wait.append(ticket.queue_wait)
+            export_latency.append(time.perf_counter() - start)
+            time.sleep(args.export_interval)
+
+    def probe():
+        while not stop.is_set():
+            start = time.perf_counter()
+            sum(range(2000))
+            probe_latency.append(time.perf_counter() - start)
+            time.sleep(0.05)
+
+    probe_thread = threading.Thread(target=probe)
+    probe_thread.start()
+    start = time.perf_counter()
+    uploaders = [threading.Thread(target=upload, args=(p,)) for p in pdf_paths]
+    for t in uploaders:
+        t.start()
+    time.sleep(0.2)
+    exporter = threading.Thread(target=exports)
+    exporter.start()
+    for t in uploaders:
+        t.join()
+    bulk_seconds = time.perf_counter() - start
+    exporter.join()
+    stop.set()
+    probe_thread.join()
+    return {
+        'export_p50': percentile(export_latency, 0.5), 'export_p95': percentile(export_latency, 0.95),
+        'export_wait_p95': percentile(export_wait, 0.95),
+        'probe_p50': percentile(probe_latency, 0.5), 'probe_p95': percentile(probe_latency, 0.95),
+        'probe_max': max(probe_latency), 'bulk_seconds': bulk_seconds,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='CPU调度基准')
+    parser.add_argument('--uploads', type=int, default=3, help='同时上传的整期PDF数')
+    parser.add_argument('--articles', type=int, default=60)
+    parser.add_argument('--pages-per-article', type=int, default=4)
+    parser.add_argument('--parse-workers', type=int, default=2, help='每个解析任务的进程池大小')
+    parser.add_argument('--slots', type=int, default=0, help='计算槽数，默认CPU核数')
+    parser.add_argument('--exports', type=int, default=20)
+    parser.add_argument('--export-rows', type=int, default=500)
+    parser.add_argument('--export-interval', type=float, default=0.2)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    work = tempfile.mkdtemp()
+    pdf_paths = []
+    for i in range(args.uploads):
+        path = os.path.join(work, f'issue_{i}.pdf')
+        generate_issue(path, articles=args.articles, pages_per_article=args.pages_per_article)
+        pdf_paths.append(path)
+    print(f"{args.uploads} 个上传 × {args.articles * args.pages_per_article} 页，每个解析 {args.parse_workers} 进程，"
+          f"CPU {os.cpu_count()} 核，计算槽 {args.slots or os.cpu_count()}")
+    print(f"{'方式':<10}{'导出p50':>10}{'导出p95':>10}{'其中排队p95':>12}{'轻量p50(ms)':>13}"
+          f"{'轻量p95(ms)':>13}{'轻量最大(ms)':>14}{'解析总耗时':>12}")
+    for mode, label in (('unscheduled', '不调度'), ('scheduled', '调度')):
+        r = run(mode, pdf_paths, args)
+        print(f"{label:<10}{r['export_p50']:>10.3f}{r['export_p95']:>10.3f}{r['export_wait_p95']:>12.3f}"
+              f"{r['probe_p50'] * 1000:>13.2f}{r['probe_p95'] * 1000:>13.2f}{r['probe_max'] * 1000:>14.2f}"
+              f"{r['bulk_seconds']:>12.2f}")
+
+if __name__ == '__main__':
+    main()
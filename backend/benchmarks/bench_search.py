@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+论文检索基准：在 N 篇合成论文（中英文标题混合）上建立倒排索引，统计各类查询的延迟，
+并核对增量同步（新增、修改、删除）后的结果。
+
+用法（在 backend 目录下）:
+    python benchmarks/bench_search.py [--papers 100000] [--db sqlite:///bench.db]
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from flask import Flask
+from sqlalchemy import insert
+
+from models import db, User, Journal, Paper
+from services.paper_store import paper_row
+from services.search_index import PaperSearchIndex
+
+EN_WORDS = ['textile', 'fiber', 'polymer', 'composite', 'fabric', 'dyeing', 'spinning', 'membrane', 'analysis',
+            'design', 'performance', 'structure', 'modeling', 'optimization', 'thermal', 'electrospun', 'nanofiber',
+            'yarn', 'knitted', 'woven', 'carbon', 'graphene', 'cotton', 'silk', 'wool', 'sensor', 'wearable']
+CN_WORDS = ['纺织', '纤维', '高分子', '复合材料', '织物', '染整', '纺丝', '薄膜', '分析', '设计', '性能',
+            '结构', '建模', '优化', '热学', '静电纺', '纳米纤维', '纱线', '针织', '机织', '石墨烯', '棉', '传感器']
+SURNAMES = ['HUANG', 'ZHAO', 'LI', 'WANG', 'ZHANG', 'LIU', 'CHEN', 'YANG', 'ZHOU', 'WU', 'XU', 'SUN']
+GIVEN = ['Jiacui', 'Mingbo', 'Wei', 'Fang', 'Jun', 'Lei', 'Yan', 'Hui', 'Qiang', 'Xiaoming']
+
+def make_records(n, rng):
+    records = []
+    for i in range(n):
+        if i % 4 == 0:
+            title = ''.join(rng.choice(CN_WORDS) for _ in range(5)) + '的研究'
+        else:
+            title = ' '.join(rng.choice(EN_WORDS) for _ in range(7)).capitalize()
+        authors = [f"{rng.choice(SURNAMES)} {rng.choice(GIVEN)}" for _ in range(3)]
+        records.append({
+            'title': title,
+            'authors': ', '.join(authors),
+            'keywords': ', '.join(rng.choice(EN_WORDS) for _ in range(4)),
+            'doi': f'10.19884/j.1672-5220.{202000000 + i}',
+            'page_start': 100 + i % 900,
+            'manuscript_id': f'E{i:07d}',
+            'pdf_pages': 8,
+            'first_author': authors[0],
+            'corresponding': authors[-1],
+            'issue': '2025, 42(3)',
+            'is_dhu': i % 2 == 0,
+        })
+    return records
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+def main():
+    parser = argparse.ArgumentParser(description='论文检索基准')
+    parser.add_argument('--papers', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=200, help='每类查询的次数')
+    parser.add_argument('--db', help='SQLAlchemy 连接串，默认临时 SQLite 文件')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(0)
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = args.db or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user = User(username='bench', password_hash='x')
+        db.session.add(user)
+        db.session.flush()
+        journals = [Journal(title='东华学报', issue=f'第{k + 1}期', created_by=user.id) for k in range(20)]
+        db.session.add_all(journals)
+        db.session.flush()
+        records = make_records(args.papers, rng)
+        for start in range(0, len(records), 5000):
+            db.session.execute(insert(Paper), [paper_row(journals[(start + k) % 20], r, 'bench.pdf')
+                                               for k, r in enumerate(records[start:start + 5000])])
+        db.session.commit()
+
+        index = PaperSearchIndex(refresh_interval=0)
+        start = time.perf_counter()
+        index.refresh(db.session)
+        print(f"{args.papers} 篇论文，建索引 {time.perf_counter() - start:.2f} s")
+
+        cases = {
+            '单个常见英文词': lambda: rng.choice(EN_WORDS),
+            '两个英文词': lambda: f"{rng.choice(EN_WORDS)} {rng.choice(EN_WORDS)}",
+            '英文前缀': lambda: rng.choice(EN_WORDS)[:4],
+            '中文词': lambda: rng.choice(CN_WORDS),
+            '中英文混合': lambda: f"{rng.choice(CN_WORDS)} {rng.choice(EN_WORDS)}",
+            '作者姓名': lambda: f"{rng.choice(SURNAMES)} {rng.choice(GIVEN)}",
+            '精确DOI': lambda: f"10.19884/j.1672-5220.{202000000 + rng.randrange(args.papers)}",
+        }
+        print(f"{'查询类型':<12}{'p50(ms)':>10}{'p95(ms)':>10}{'平均命中':>10}")
+        for name, make_query in cases.items():
+            samples, hits = [], 0
+            for _ in range(args.queries):
+                q = make_query()
+                t0 = time.perf_counter()
+                total, _ = index.search(q, limit=20)
+                samples.append((time.perf_counter() - t0) * 1000)
+                hits += total
+            print(f"{name:<12}{percentile(samples, 0.5):>10.2f}{percentile(samples, 0.95):>10.2f}"
+                  f"{hits // args.queries:>10}")
+
+        # 增量同步核对
+        new = Paper(**paper_row(journals[0], dict(records[0], title='Quasicrystal lattice weaving',
+                                                   doi='10.19884/new.1'), 'bench.pdf'))
+        db.session.add(new)
+        db.session.commit()
+        index.refresh(db.session)
+        assert index.search('quasicrystal')[1][0][0] == new.id, '新增论文未被索引'
+        new.title = 'Hyperbolic lattice weaving'
+        db.session.commit()
+        index.refresh(db.session)
+        assert index.search('quasicrystal')[0] == 0 and index.search('hyperbolic')[0] == 1, '修改未同步'
+        db.session.delete(new)
+        db.session.commit()
+        index.refresh(db.session)
+        assert index.search('hyperbolic')[0] == 0, '删除未同步'
+        print("增量同步核对通过（新增 / 修改 / 删除）")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+部署方式压测：开学集中登录的同时，其他编辑在浏览期刊列表。
+
+分别启动
+- 开发服务器: python app.py 的方式（单进程 Werkzeug 线程服务器），bcrypt 校验不限并发，
+              相当于原来在请求线程中直接调用 checkpw
+- gunicorn:   gunicorn -c gunicorn.conf.py（预加载、多工作进程、bcrypt 有界线程池）
+在同一个临时 SQLite 库上，用 --login-clients 个并发客户端持续登录、--browse-clients 个并发客户端
+交替请求 /api/health 和 /api/journals，持续 --duration 秒，报告两类请求的 请求/秒 和延迟。
+
+用法（在 backend 目录下）:
+    python benchmarks/bench_serving.py [--duration 20] [--login-clients 8] [--browse-clients 8] [--workers 0]
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+import http.client
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+DEV_SERVER = (
+    "import app; app.init_db(); "
+    "app.app.run(host='127.0.0.1', port={port}, debug=False, threaded=True)"
+)
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def wait_ready(port, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/api/health')
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('服务未能启动')
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+def client(port, kind, stop, samples, errors):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    body = json.dumps({'username': 'admin', 'password': 'admin123'})
+    paths = ['/api/health', '/api/journals?limit=20']
+    n = 0
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            if kind == 'login':
+                conn.request('POST', '/api/login', body, {'Content-Type': 'application/json'})
+            else:
+                conn.request('GET', paths[n % 2])
+                n += 1
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 500:
+                errors[kind] += 1
+                continue
+            samples[kind].append((time.perf_counter() - start, response.status))
+        except (OSError, http.client.HTTPException):
+            errors[kind] += 1
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+
+def run(label, command, env, port, args):
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_ready(port)
+        stop = threading.Event()
+        samples = {'login': [], 'browse': []}
+        errors = {'login': 0, 'browse': 0}
+        threads = [threading.Thread(target=client, args=(port, 'login', stop, samples, errors))
+                   for _ in range(args.login_clients)]
+        threads += [threading.Thread(target=client, args=(port, 'browse', stop, samples, errors))
+                    for _ in range(args.browse_clients)]
+        for t in threads:
+            t.start()
+        time.sleep(args.duration)
+        stop.set()
+        for t in threads:
+            t.join()
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+    for kind in ('login', 'browse'):
+        latencies = [s[0] for s in samples[kind]]
+        ok = sum(1 for s in samples[kind] if s[1] < 400)
+        throttled = sum(1 for s in samples[kind] if s[1] == 429)
+        print(f"{label:<12}{kind:<8}{len(latencies) / args.duration:>10.1f}{ok:>8}{throttled:>8}"
+              f"{percentile(latencies, 0.5) * 1000:>10.1f}{percentile(latencies, 0.95) * 1000:>10.1f}"
+              f"{errors[kind]:>8}")
+
+def main():
+    parser = argparse.ArgumentParser(description='部署方式压测')
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--login-clients', type=int, default=8)
+    parser.add_argument('--browse-clients', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=0, help='gunicorn 工作进程数，默认按配置文件')
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp()
+    base_env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(work, 'bench.db')}",
+                    STORAGE_SWEEP_INTERVAL='0', LOG_LEVEL='WARNING', PYTHONPATH=BACKEND_DIR)
+    # 先建表和默认管理员，两种方式使用同一个库
+    subprocess.run([sys.executable, '-c', 'import app; app.init_db()'], cwd=BACKEND_DIR, env=base_env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    print(f"CPU {os.cpu_count()} 核, 登录客户端 {args.login_clients}, 浏览客户端 {args.browse_clients}, "
+          f"每种方式 {args.duration:.0f}s")
+    print(f"{'方式':<12}{'请求':<8}{'请求/秒':>10}{'成功':>8}{'429':>8}{'p50(ms)':>10}{'p95(ms)':>10}{'错误':>8}")
+
+    port = free_port()
+    run('开发服务器', [sys.executable, '-c', DEV_SERVER.format(port=port)],
+        dict(base_env, LOGIN_HASH_WORKERS='64', LOGIN_MAX_PENDING='1000'), port, args)
+
+    port = free_port()
+    command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}',
+               '--access-logfile', '/dev/null']
+    if args.workers:
+        command += ['--workers', str(args.workers)]
+    run('gunicorn', command, base_env, port, args)
+
+if __name__ == '__main__':
+    main()
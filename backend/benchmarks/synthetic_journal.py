@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+合成期刊PDF生成器
+
+按 pdf_parser 预期的版式生成整期学报：每篇文章首页依次为
+页眉（含 "Vol. N No. N YYYY" 和行末三位页码；刊名用缩写，避免干扰 is_dhu 判断）、DOI行、两行标题、作者行、单位，
+正文中包含 "Correspondence should be addressed to ..."；其余页只有页眉页码和正文。
+figure_kb > 0 时其余页各嵌入一张该大小的随机噪声图（不可压缩），用于模拟图片较多的大文件。
+
+用法（在 backend 目录下）:
+    python benchmarks/synthetic_journal.py 输出.pdf --articles 100 --pages-per-article 4
+
+作为模块使用时 generate_issue() 同时返回每篇文章的期望解析结果，可用于核对准确率。
+"""
+
+import sys
+import random
+import argparse
+from typing import List, Dict, Any
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+from PIL import Image
+
+SURNAMES = ['HUANG', 'ZHAO', 'LI', 'WANG', 'ZHANG', 'LIU', 'CHEN', 'YANG', 'ZHOU', 'WU', 'XU', 'SUN']
+GIVEN_NAMES = ['Jiacui', 'Mingbo', 'Wei', 'Fang', 'Jun', 'Lei', 'Yan', 'Hui', 'Qiang', 'Xiaoming']
+TITLE_WORDS = ['Textile', 'Fiber', 'Polymer', 'Composite', 'Fabric', 'Dyeing', 'Spinning', 'Membrane',
+               'Analysis', 'Design', 'Performance', 'Structure', 'Modeling', 'Optimization']
+BODY_LINE = 'The experimental results show that the proposed method improves the performance.'
+
+def _author(rng: random.Random) -> str:
+    return f"{rng.choice(SURNAMES)} {rng.choice(GIVEN_NAMES)}"
+
+def generate_issue(path: str, articles: int = 10, pages_per_article: int = 4, volume: int = 42,
+                   number: int = 3, year: int = 2025, first_page: int = 101, seed: int = 0,
+                   body_lines: int = 40, figure_kb: int = 0) -> List[Dict[str, Any]]:
+    """生成合成期刊PDF，返回每篇文章的期望字段列表"""
+    rng = random.Random(seed)
+    width, height = A4
+    c = canvas.Canvas(path, pagesize=A4)
+    expected = []
+    page_index = 0
+
+    def page_label(index: int) -> int:
+        # extract_start_page 只识别三位页码，超长合成刊的页码在 100-999 内循环
+        return 100 + (first_page - 100 + index) % 900
+
+    for i in range(articles):
+        authors = []
+        while len(authors) < rng.randint(2, 4):
+            name = _author(rng)
+            if name not in authors:
+                authors.append(name)
+        corresponding = authors[-1]
+        title_1 = ' '.join(rng.choice(TITLE_WORDS) for _ in range(5))
+        title_2 = ' '.join(rng.choice(TITLE_WORDS) for _ in range(3))
+        # 稿件号尾部 YYYYMMNNN，月份随 seed 和千位递增：同一期12000篇以内DOI不重复，
+        # 1000篇以内的各期只要 seed 模12不同，放进同一个库也不冲突
+        tail = f"{year - 1}{(seed + i // 1000) % 12 + 1:02d}{i % 1000:03d}"
+        doi = f"10.19884/j.1672-5220.{tail}"
+        is_dhu = i % 3 != 0
+        affiliation = 'College of Textiles, Donghua University, Shanghai 201620, China' if is_dhu \
+            else 'School of Materials, Some Other University, Beijing 100000, China'
+
+        expected.append({
+            'doi': doi,
+            'manuscript_id': f"E{tail[:4]}-{tail[4:]}",
+            'start_page': page_label(page_index),
+            'title': f"{title_1} {title_2}",
+            'authors': ', '.join(authors),
+            'first_author': authors[0],
+            'corresponding': corresponding,
+            'issue': f"{year}, {volume}({number})",
+            'is_dhu': is_dhu,
+        })
+
+        for p in range(pages_per_article):
+            y = height - 50
+
+            def line(text: str) -> None:
+                nonlocal y
+                c.drawString(50, y, text)
+                y -= 14
+
+            # 在每页开头设置字体：showPage 之后再设置会让 save() 多出一个空白页
+            c.setFont('Helvetica', 10)
+            page_no = page_label(page_index)
+            if p == 0:
+                line(f"Journal of DHU (English Edition)   Vol. {volume} No. {number} {year}   {page_no}")
+                line(f"DOI: {doi}")
+                line(title_1)
+                line(title_2)
+                # 通讯作者带星号，作者之间单空格分隔，由 normalize_authors_for_display 两两配对
+                line(' '.join(a + ('∗' if a == corresponding else '') for a in authors))
+                line(affiliation)
+                for _ in range(body_lines // 2):
+                    line(BODY_LINE)
+                line(f"Correspondence should be addressed to {corresponding}, E-mail: author{i}@dhu.edu.cn")
+            else:
+                line(f"{page_no}   Journal of DHU (English Edition)")
+                for _ in range(body_lines):
+                    line(BODY_LINE)
+                if figure_kb:
+                    # 每页内容不同，reportlab 不会合并成同一个图片对象
+                    side = int((figure_kb * 1024 / 3) ** 0.5)
+                    figure = Image.frombytes('RGB', (side, side), rng.randbytes(side * side * 3))
+                    c.drawImage(ImageReader(figure), 50, 60, width=200, height=200)
+            c.showPage()
+            page_index += 1
+
+    c.save()
+    return expected
+
+def main():
+    parser = argparse.ArgumentParser(description='生成合成期刊PDF')
+    parser.add_argument('output', help='输出PDF路径')
+    parser.add_argument('--articles', type=int, default=10)
+    parser.add_argument('--pages-per-article', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    expected = generate_issue(args.output, args.articles, args.pages_per_article, seed=args.seed)
+    print(f"已生成 {args.output}: {len(expected)} 篇文章, {len(expected) * args.pages_per_article} 页",
+          file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+生产部署的 gunicorn 配置（Linux；Windows 开发环境仍用 python app.py）
+
+用法（在 backend 目录下）:
+    gunicorn -c gunicorn.conf.py
+
+- 主进程预加载应用（preload_app）后派生 WEB_WORKERS 个工作进程，每个进程 WEB_THREADS 个请求线程
+- 每个工作进程各有一个数据库连接池，默认大小 = 请求线程数 + 后台解析线程数
+- 解析/导出的计算槽按工作进程数分摊CPU核。计算槽的准入控制只在进程内生效，每个进程至少 1 个槽，
+  所以默认工作进程数等于核数（最多 8 个），各进程的槽合计等于核数；请求并发靠每进程的线程数。
+  WEB_WORKERS 设得比核数多时槽合计会超过核数（超订），启动时会记录警告
+- 上传和同步解析可能持续数分钟，请求超时放宽到 WEB_TIMEOUT 秒
+"""
+
+import os
+import multiprocessing
+
+cores = multiprocessing.cpu_count()
+
+bind = os.environ.get('WEB_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_WORKERS', str(min(cores, 8))))
+worker_class = 'gthread'
+threads = int(os.environ.get('WEB_THREADS', '8'))
+timeout = int(os.environ.get('WEB_TIMEOUT', '600'))
+graceful_timeout = 60
+keepalive = 5
+# 定期重启工作进程，防止长期运行的内存增长（加随机抖动，避免同时重启）
+max_requests = int(os.environ.get('WEB_MAX_REQUESTS', '2000'))
+max_requests_jitter = 200
+preload_app = True
+wsgi_app = 'app:create_app()'
+accesslog = os.environ.get('WEB_ACCESS_LOG', '-')
+
+# 以下环境变量在预加载应用之前设置，app.py 读取时按多进程部署取值
+os.environ['SERVER_PREFORK'] = '1'
+os.environ.setdefault('SCHED_CPU_SLOTS', str(max(1, cores // workers)))
+os.environ.setdefault('LOGIN_HASH_WORKERS', str(max(1, cores // workers)))
+os.environ.setdefault('DB_POOL_SIZE', str(threads + int(os.environ.get('PARSE_JOB_WORKERS', '2'))))
+os.environ.setdefault('DB_MAX_OVERFLOW', '2')
+
+def when_ready(server):
+    slots = int(os.environ['SCHED_CPU_SLOTS'])
+    if workers * slots > cores:
+        server.log.warning(f"{workers} 个工作进程 × {slots} 个计算槽 = {workers * slots}，超过CPU核数 {cores}，"
+                           f"解析/导出任务会超订CPU；建议 WEB_WORKERS 不超过核数")
+
+def post_fork(server, worker):
+    """工作进程派生后：丢弃继承的数据库连接，启动本进程的后台线程"""
+    import app
+    app.init_worker()
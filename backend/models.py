@@ -102,6 +102,9 @@ class Paper(db.Model):
     abstract = db.Column(db.Text)
     keywords = db.Column(db.Text)
     file_path = db.Column(db.String(500))
+    offprint_path = db.Column(db.String(500))  # 从整期PDF拆出的单篇抽印本
+    offprint_pages = db.Column(db.Integer)  # 抽印本的真实页数
+    content_hash = db.Column(db.String(40))  # 解析内容字段的SHA-1，重新导入时据此跳过未变化的论文
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -112,6 +115,8 @@ class Paper(db.Model):
     __table_args__ = (
         db.Index('idx_journal_id', 'journal_id'),
         db.Index('idx_page_start', 'page_start'),
+        # DOI全局唯一（稿件号由DOI派生），重新导入时按DOI upsert
+        db.UniqueConstraint('doi', name='uq_paper_doi'),
     )
 
 class FileUpload(db.Model):
@@ -124,6 +129,7 @@ class FileUpload(db.Model):
     stored_filename = db.Column(db.String(255), nullable=False)
     file_type = db.Column(db.Enum('pdf', 'docx', 'xlsx'), nullable=False)
     file_size = db.Column(db.BigInteger)
+    file_hash = db.Column(db.String(64), index=True)  # 文件内容SHA-256，用于去重和解析缓存
     upload_path = db.Column(db.String(500), nullable=False)
     upload_status = db.Column(db.Enum('uploading', 'processing', 'completed', 'failed'), default='uploading')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -0,0 +1,77 @@
+import os
+import zipfile
+import logging
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from services.page_text_cache import PageTextCache
+from services.pdf_parser import iter_pdf_papers, DEFAULT_BACKEND
+
+logger = logging.getLogger(__name__)
+
+class BatchLimitError(ValueError):
+    """批量上传超出文件数或解压大小限制"""
+
+def iter_zip_members(stream: BinaryIO, max_files: int, max_bytes: int) -> Iterator[Tuple[str, BinaryIO]]:
+    """
+    逐个产出压缩包中的文件 (文件名, 只读流)，跳过目录和 macOS 元数据。
+    先按中央目录中声明的大小检查限制，防止解压炸弹占满磁盘
+    """
+    with zipfile.ZipFile(stream) as archive:
+        members = [m for m in archive.infolist()
+                   if not m.is_dir() and not m.filename.startswith('__MACOSX/')]
+        if len(members) > max_files:
+            raise BatchLimitError(f"压缩包内文件数 {len(members)} 超过上限 {max_files}")
+        total = sum(m.file_size for m in members)
+        if total > max_bytes:
+            raise BatchLimitError(f"压缩包解压后大小 {total} 字节超过上限 {max_bytes}")
+        for member in members:
+            with archive.open(member) as member_stream:
+                yield os.path.basename(member.filename), member_stream
+
+def _parse_file(args: Tuple[str, bool, str, Optional[str], Optional[PageTextCache]]) -> Tuple[
+        List[Dict[str, Any]], Optional[str]]:
+    """进程池工作函数：串行解析一个PDF，返回 (记录, 错误信息)；给了页面文本缓存时顺带写入逐页文本"""
+    pdf_path, prefilter, backend, file_hash, page_cache = args
+    try:
+        stats = {}
+        # 逐页文本边提取边写入缓存，不在内存中收集
+        with page_cache.writer(file_hash) if page_cache is not None else nullcontext() as pages:
+            records = list(iter_pdf_papers(pdf_path, workers=0, prefilter=prefilter, stats=stats,
+                                           backend=backend, page_texts=pages))
+            if pages is not None:
+                pages.commit(stats['pages'])
+        return records, None
+    except Exception as e:
+        return [], str(e)
+
+def parse_files(paths: List[str], workers: int = 0, prefilter: bool = True,
+                backend: str = DEFAULT_BACKEND, page_cache: Optional[PageTextCache] = None,
+                hashes: Optional[Dict[str, str]] = None) -> Dict[str, Tuple[List[Dict[str, Any]], Optional[str]]]:
+    """
+    并发解析多个PDF，每个文件一个任务，返回 路径 → (记录, 错误信息)。
+    单个文件失败不影响其他文件；workers <= 1 或只有一个文件时在当前进程串行解析，
+    进程池异常时未完成的文件回退到串行解析。
+    传入 page_cache 和 路径 → 文件哈希 时，各工作进程把逐页文本写入页面文本缓存
+    """
+    results: Dict[str, Tuple[List[Dict[str, Any]], Optional[str]]] = {}
+    hashes = hashes or {}
+    jobs = [(path, prefilter, backend, hashes.get(path), page_cache) for path in paths]
+    if workers > 1 and len(jobs) > 1:
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(jobs)))
+        try:
+            futures = [(job, executor.submit(_parse_file, job)) for job in jobs]
+            for job, future in futures:
+                try:
+                    results[job[0]] = future.result()
+                except BrokenProcessPool as pool_error:
+                    logger.warning(f"进程池异常，剩余文件回退到串行解析: {str(pool_error)}")
+                    break
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    for job in jobs:
+        if job[0] not in results:
+            results[job[0]] = _parse_file(job)
+    return results
@@ -0,0 +1,85 @@
+import io
+import re
+import zipfile
+import logging
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from services.document_generator import write_toc_docx, write_excel_stats, write_combined_stats
+
+logger = logging.getLogger(__name__)
+
+# 一个导出任务：(zip内文件名, 渲染函数名, 数据)；数据是可pickle的普通dict列表，供工作进程使用
+ExportTask = Tuple[str, str, Any]
+
+class _ZipStream(io.RawIOBase):
+    """
+    zipfile 的只写、不可定位输出：写入的字节暂存起来，由 drain() 取走。
+    zipfile 检测到不可定位时改用数据描述符，无需回写本地文件头
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+def safe_entry_name(name: str) -> str:
+    """zip 内文件名不能含路径分隔符"""
+    return re.sub(r'[\\/]', '_', name)
+
+def _render(kind: str, data: Any) -> bytes:
+    """工作进程中生成一个文档，返回文件内容"""
+    buffer = io.BytesIO()
+    if kind == 'toc':
+        write_toc_docx(data, buffer)
+    elif kind == 'excel':
+        write_excel_stats(data, buffer)
+    elif kind == 'excel_combined':
+        write_combined_stats(data, buffer)
+    else:
+        raise ValueError(f"未知的导出类型: {kind}")
+    return buffer.getvalue()
+
+def iter_zip(tasks: List[ExportTask], cached: Optional[Dict[str, str]] = None,
+             workers: int = 0) -> Iterator[bytes]:
+    """
+    生成zip响应体：已缓存的产物（zip内文件名 → 磁盘路径）直接打包，
+    其余任务在进程池中并行生成，哪个先完成就先写入zip并立即产出，
+    客户端无需等待全部文档生成完毕。workers <= 1 时在当前进程依次生成
+    """
+    stream = _ZipStream()
+    archive = zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_DEFLATED)
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 and len(tasks) > 1 else None
+    try:
+        for name, path in (cached or {}).items():
+            archive.write(path, name)
+            yield stream.drain()
+
+        if executor is None:
+            for name, kind, data in tasks:
+                archive.writestr(name, _render(kind, data))
+                yield stream.drain()
+        else:
+            pending = {executor.submit(_render, kind, data): name for name, kind, data in tasks}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    archive.writestr(pending.pop(future), future.result())
+                yield stream.drain()
+
+        archive.close()
+        yield stream.drain()
+    finally:
+        # 客户端中途断开时生成器被关闭，取消尚未开始的任务
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,252 @@
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import secrets
+import tempfile
+import threading
+from typing import Any, BinaryIO, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 分块写盘时每次从请求流读取的字节数
+READ_SIZE = 1024 * 1024
+# 分块锁文件超过这段时间仍未释放，视为写入进程已退出留下的残留
+STALE_LOCK_SECONDS = 600
+
+_SESSION_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+class UploadSessionError(ValueError):
+    """分块上传请求不合法，status 为应返回的HTTP状态码，extra 附加到响应中"""
+
+    def __init__(self, message: str, status: int = 400, **extra: Any):
+        super().__init__(message)
+        self.status = status
+        self.extra = extra
+
+class ChunkedUploadStore:
+    """
+    可续传的分块上传会话，状态全部落盘，任一工作进程都能接着处理：
+
+        <folder>/<会话id>.part   目标文件，分块按偏移直接追加写入
+        <folder>/<会话id>.json   会话状态：文件名、声明大小、已确认的偏移和分块数
+        <folder>/<会话id>.lock   正在写入分块时存在（O_EXCL 创建），同一会话同时只写一个分块
+
+    分块写入时增量计算SHA-256，完成时无需再读一遍文件。哈希对象只保存在内存里：
+    换了工作进程或重启后首次续传，从 .part 文件已确认的部分重新计算一次。
+    写入中断（连接断开）的分块不确认，下次从已确认的偏移重新写，残留的尾部会被截掉。
+    """
+
+    def __init__(self, folder: str, max_sessions: int = 8, max_chunk_bytes: int = 32 * 1024 * 1024,
+                 max_file_bytes: int = 0, ttl: float = 24 * 3600):
+        self.folder = folder
+        self.max_sessions = max_sessions
+        self.max_chunk_bytes = max_chunk_bytes
+        self.max_file_bytes = max_file_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # 会话id → (哈希对应的偏移, 哈希对象)
+        self._hashes: Dict[str, Tuple[int, Any]] = {}
+
+    def _path(self, session_id: str, suffix: str) -> str:
+        if not _SESSION_ID_RE.match(session_id or ''):
+            raise UploadSessionError('上传会话不存在', 404)
+        return os.path.join(self.folder, f"{session_id}.{suffix}")
+
+    def _load(self, session_id: str) -> Dict[str, Any]:
+        try:
+            with open(self._path(session_id, 'json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise UploadSessionError('上传会话不存在或已过期', 404)
+
+    def _save(self, state: Dict[str, Any]) -> None:
+        """先写临时文件再原子替换，读取方不会看到半个状态文件"""
+        state['updated_at'] = time.time()
+        fd, tmp_path = tempfile.mkstemp(dir=self.folder, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(state['id'], 'json'))
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _remove(self, session_id: str) -> None:
+        for suffix in ('part', 'json', 'lock'):
+            try:
+                os.remove(self._path(session_id, suffix))
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self._hashes.pop(session_id, None)
+
+    def _session_ids(self):
+        if not os.path.isdir(self.folder):
+            return []
+        return [name[:-5] for name in os.listdir(self.folder)
+                if name.endswith('.json') and _SESSION_ID_RE.match(name[:-5])]
+
+    def expire(self) -> int:
+        """删除超过 ttl 秒没有新分块的会话，返回删除数"""
+        now = time.time()
+        expired = 0
+        for session_id in self._session_ids():
+            try:
+                mtime = os.path.getmtime(self._path(session_id, 'json'))
+            except FileNotFoundError:
+                continue
+            if self.ttl and now - mtime > self.ttl:
+                self._remove(session_id)
+                expired += 1
+        if expired:
+            logger.info(f"清理过期上传会话 {expired} 个")
+        return expired
+
+    def create(self, filename: str, size: int, **meta: Any) -> Dict[str, Any]:
+        """新建会话并创建空的目标文件；活跃会话已达上限时返回429"""
+        if size < 0:
+            raise UploadSessionError('文件大小无效')
+        if self.max_file_bytes and size > self.max_file_bytes:
+            raise UploadSessionError(f"文件大小 {size} 字节超过上限 {self.max_file_bytes}", 413)
+        os.makedirs(self.folder, exist_ok=True)
+        self.expire()
+        active = len(self._session_ids())
+        if active >= self.max_sessions:
+            raise UploadSessionError(f"进行中的上传会话已达上限 {self.max_sessions}", 429)
+        state = {
+            'id': secrets.token_hex(16),
+            'filename': filename,
+            'size': size,
+            'offset': 0,
+            'chunks': 0,
+            'created_at': time.time(),
+            'meta': meta,
+        }
+        open(self._path(state['id'], 'part'), 'wb').close()
+        self._save(state)
+        with self._lock:
+            self._hashes[state['id']] = (0, hashlib.sha256())
+        logger.info(f"新建上传会话: {state['id']}, {filename}, {size} 字节")
+        return state
+
+    def get(self, session_id: str) -> Dict[str, Any]:
+        return self._load(session_id)
+
+    def _acquire(self, session_id: str) -> None:
+        lock_path = self._path(session_id, 'lock')
+        try:
+            if time.time() - os.path.getmtime(lock_path) > STALE_LOCK_SECONDS:
+                os.remove(lock_path)
+        except FileNotFoundError:
+            pass
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            raise UploadSessionError('该会话正在写入另一个分块', 409)
+
+    def _hash_at(self, session_id: str, part_path: str, offset: int):
+        """已确认偏移处的哈希状态：内存中没有（换了进程或重启）时从文件重新计算"""
+        with self._lock:
+            cached = self._hashes.get(session_id)
+        if cached is not None and cached[0] == offset:
+            return cached[1].copy()
+        sha256 = hashlib.sha256()
+        remaining = offset
+        with open(part_path, 'rb') as f:
+            while remaining:
+                block = f.read(min(READ_SIZE, remaining))
+                if not block:
+                    raise UploadSessionError('已上传的数据不完整，请重新上传', 409)
+                sha256.update(block)
+                remaining -= len(block)
+        logger.info(f"上传会话 {session_id} 从文件恢复哈希状态: {offset} 字节")
+        return sha256
+
+    def write_chunk(self, session_id: str, index: int, offset: int, length: Optional[int],
+                    stream: BinaryIO) -> Dict[str, Any]:
+        """
+        写入第 index 个分块（从0开始），offset 必须等于已确认的偏移。
+        重发已确认过的分块（客户端没收到上次的响应）直接返回当前状态；
+        序号或偏移对不上返回409，响应中带已确认的偏移供客户端续传
+        """
+        state = self._load(session_id)
+        if index < state['chunks'] and offset < state['offset']:
+            return state
+        if index != state['chunks'] or offset != state['offset']:
+            raise UploadSessionError(f"分块序号或偏移不连续，应从第 {state['chunks']} 块、偏移 {state['offset']} 继续",
+                                     409, offset=state['offset'], nextChunk=state['chunks'])
+        if length is None:
+            raise UploadSessionError('分块请求缺少 Content-Length', 411)
+        if length <= 0 or length > self.max_chunk_bytes:
+            raise UploadSessionError(f"分块大小应在 1 到 {self.max_chunk_bytes} 字节之间", 413)
+        if offset + length > state['size']:
+            raise UploadSessionError(f"分块超出声明的文件大小 {state['size']}", 413)
+
+        self._acquire(session_id)
+        try:
+            # 拿到锁后重新读取状态，期间可能有其他进程确认了同一分块
+            state = self._load(session_id)
+            if offset != state['offset']:
+                raise UploadSessionError('分块已被其他请求写入', 409,
+                                         offset=state['offset'], nextChunk=state['chunks'])
+            part_path = self._path(session_id, 'part')
+            sha256 = self._hash_at(session_id, part_path, offset)
+            written = 0
+            with open(part_path, 'r+b') as out:
+                out.seek(offset)
+                out.truncate()
+                while written < length:
+                    block = stream.read(min(READ_SIZE, length - written))
+                    if not block:
+                        break
+                    sha256.update(block)
+                    out.write(block)
+                    written += len(block)
+            if written != length:
+                raise UploadSessionError(f"分块数据不完整: 收到 {written}/{length} 字节", 400,
+                                         offset=state['offset'], nextChunk=state['chunks'])
+            state['offset'] += written
+            state['chunks'] += 1
+            self._save(state)
+            with self._lock:
+                self._hashes[session_id] = (state['offset'], sha256)
+            return state
+        finally:
+            try:
+                os.remove(self._path(session_id, 'lock'))
+            except FileNotFoundError:
+                pass
+
+    def complete(self, session_id: str, dest_path: str, expected_sha256: Optional[str] = None) -> Tuple[
+            Dict[str, Any], str]:
+        """
+        校验大小（和客户端给出的SHA-256）后把目标文件移到 dest_path，删除会话，
+        返回 (会话状态, 十六进制摘要)
+        """
+        self._acquire(session_id)
+        try:
+            state = self._load(session_id)
+            if state['offset'] != state['size']:
+                raise UploadSessionError(f"文件尚未传完: {state['offset']}/{state['size']} 字节", 409,
+                                         offset=state['offset'], nextChunk=state['chunks'])
+            part_path = self._path(session_id, 'part')
+            digest = self._hash_at(session_id, part_path, state['offset']).hexdigest()
+            if expected_sha256 and expected_sha256.lower() != digest:
+                raise UploadSessionError('文件SHA-256校验失败', 422, sha256=digest)
+            os.replace(part_path, dest_path)
+        finally:
+            try:
+                os.remove(self._path(session_id, 'lock'))
+            except FileNotFoundError:
+                pass
+        self._remove(session_id)
+        logger.info(f"上传会话完成: {session_id}, {state['size']} 字节, {state['chunks']} 个分块")
+        return state, digest
+
+    def abort(self, session_id: str) -> None:
+        self._load(session_id)
+        self._remove(session_id)
+        logger.info(f"取消上传会话: {session_id}")
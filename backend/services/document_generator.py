@@ -1,8 +1,10 @@
 import os
 import re
+import time
+import tempfile
 from datetime import datetime
 from pathlib import Path
-from typing import List, Any, Optional
+from typing import List, Any, Iterable, Optional
 import logging
 
 from docx import Document
@@ -10,6 +12,9 @@ from docx.shared import Pt
 from docx.oxml.ns import qn
 from openpyxl import Workbook
 
+from services.log_utils import RowSampler
+from services.metrics import EXPORT_STAGE_SECONDS, EXPORT_BYTES, EXPORT_ROWS
+
 logger = logging.getLogger(__name__)
 
 def _get(a: Any, key: str):
@@ -18,39 +23,149 @@ def _get(a: Any, key: str):
         return a.get(key)
     return getattr(a, key)
 
-def generate_toc_docx(papers: List[Any], journal: Any) -> str:
+def _save_atomic(save, output_path: str) -> None:
+    """先保存到同目录临时文件再原子替换，避免并发请求读到写了一半的文件"""
+    # 临时文件名必须每次唯一：同一进程的多个请求线程可能同时导出同一个文件
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(output_path) or '.', suffix='.tmp')
+    os.close(fd)
+    try:
+        save(tmp_path)
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _output_size(out) -> int:
+    """已保存产物的字节数：路径取文件大小，文件对象取当前写入位置"""
+    if isinstance(out, (str, os.PathLike)):
+        return os.path.getsize(out)
+    return out.tell()
+
+def _record_export(kind: str, render_seconds: float, save_start: float, out, count: int) -> None:
+    """记录一次导出的生成/保存耗时、产物大小和条数"""
+    EXPORT_STAGE_SECONDS.observe(render_seconds, kind=kind, stage='render')
+    EXPORT_STAGE_SECONDS.observe(time.perf_counter() - save_start, kind=kind, stage='save')
+    EXPORT_BYTES.observe(_output_size(out), kind=kind)
+    EXPORT_ROWS.inc(count, kind=kind)
+
+# 统计表表头 - 完全照搬参考代码
+STATS_HEADERS = ['稿件号','页数','一作','通讯','刊期','是否东华大学']
+
+def _stats_values(a: Any) -> dict:
+    """统计表一行的取值，键为表头"""
+    return {
+        '稿件号': _get(a, 'manuscript_id'),
+        '页数': _get(a, 'pdf_pages'),
+        '一作': _get(a, 'first_author'),
+        '通讯': (_get(a, 'corresponding') or ''),
+        '刊期': _get(a, 'issue'),
+        '是否东华大学': '是' if _get(a, 'is_dhu') else '否',
+    }
+
+def write_toc_docx(items: Iterable[Any], out) -> int:
+    """
+    把已按页码排好序的论文写成目录文档，out 可以是路径或文件对象，返回条目数。
+    python-docx 没有流式写出接口，文档树会整体留在内存中（每篇论文两个段落）
+    """
+    start = time.perf_counter()
+    # 创建Word文档
+    doc = Document()
+    
+    # 设置样式 - 完全按照参考代码
+    style = doc.styles['Normal']
+    style.font.name = 'Times New Roman'
+    style._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
+    style.font.size = Pt(11)
+    
+    # 添加内容 - 完全按照参考代码格式
+    count = 0
+    for a in items:
+        doc.add_paragraph(f"{_get(a,'page_start')} {_get(a,'title') or ''}")
+        doc.add_paragraph(_get(a, 'authors') or '')
+        count += 1
+    
+    save_start = time.perf_counter()
+    doc.save(out)
+    _record_export('toc', save_start - start, save_start, out, count)
+    return count
+
+def write_excel_stats(articles: Iterable[Any], out) -> int:
+    """
+    以 openpyxl 只写模式生成统计表，行数据逐行写出不在内存中保留单元格对象；
+    articles 可以是生成器，out 可以是路径或文件对象，返回行数
+    """
+    start = time.perf_counter()
+    wb = Workbook(write_only=True)
+    count = _append_stats_sheet(wb, '校内', articles)
+    
+    save_start = time.perf_counter()
+    wb.save(out)
+    _record_export('excel', save_start - start, save_start, out, count)
+    return count
+
+def _append_stats_sheet(wb: Workbook, title: str, articles: Iterable[Any]) -> int:
+    """在只写工作簿中追加一个统计表工作表（首行留空，第二行表头），返回行数"""
+    ws = wb.create_sheet(title)
+    ws.append([None])
+    ws.append(STATS_HEADERS)
+    
+    count = 0
+    for a in articles:
+        values = _stats_values(a)
+        ws.append([values[k] for k in STATS_HEADERS])
+        count += 1
+    return count
+
+# Excel 工作表名不能包含这些字符，且最长31个字符
+_SHEET_TITLE_INVALID = re.compile(r'[\\/*?:\[\]]')
+
+def _sheet_title(name: str, used: set) -> str:
+    base = _SHEET_TITLE_INVALID.sub('_', name or '').strip() or '未命名'
+    title, n = base[:31], 2
+    while title in used:
+        suffix = f"({n})"
+        title, n = base[:31 - len(suffix)] + suffix, n + 1
+    used.add(title)
+    return title
+
+def write_combined_stats(sheets: Iterable[Any], out) -> int:
+    """
+    多期合并统计表：sheets 为 (工作表名, 统计表记录) 序列，每期一个工作表，
+    工作表名按 Excel 规则清理并去重。返回总行数
+    """
+    start = time.perf_counter()
+    wb = Workbook(write_only=True)
+    used = set()
+    count = 0
+    for name, articles in sheets:
+        count += _append_stats_sheet(wb, _sheet_title(name, used), articles)
+    
+    save_start = time.perf_counter()
+    wb.save(out)
+    _record_export('excel_combined', save_start - start, save_start, out, count)
+    return count
+
+def generate_toc_docx(papers: List[Any], journal: Any, output_path: Optional[str] = None) -> str:
     """
     生成目录Word文档 - 完全照搬参考代码实现
+    不指定 output_path 时按时间戳命名保存到 uploads/
     """
     try:
-        # 创建Word文档
-        doc = Document()
-        
-        # 设置样式 - 完全按照参考代码
-        style = doc.styles['Normal']
-        style.font.name = 'Times New Roman'
-        style._element.rPr.rFonts.set(qn('w:eastAsia'), '宋体')
-        style.font.size = Pt(11)
-        
         # 按页码排序 - 完全按照参考代码逻辑
         items = sorted([a for a in papers if _get(a, 'page_start') is not None], 
                       key=lambda x: _get(x, 'page_start'))
         
-        # 添加内容 - 完全按照参考代码格式
-        for a in items:
-            doc.add_paragraph(f"{_get(a,'page_start')} {_get(a,'title') or ''}")
-            doc.add_paragraph(_get(a, 'authors') or '')
-        
         # 保存文件
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"目录_{journal.issue}_{timestamp}.docx"
-        output_path = os.path.join('uploads', filename)
+        if output_path is None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f"目录_{journal.issue}_{timestamp}.docx"
+            output_path = os.path.join('uploads', filename)
         
         # 确保目录存在
-        os.makedirs('uploads', exist_ok=True)
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
         
-        doc.save(output_path)
-        logger.info(f"目录文档已生成: {output_path}")
+        _save_atomic(lambda path: write_toc_docx(items, path), output_path)
+        logger.info("目录文档已生成: %s", output_path)
         
         return output_path
         
@@ -58,67 +173,31 @@ def generate_toc_docx(papers: List[Any], journal: Any) -> str:
         logger.error(f"生成目录文档失败: {str(e)}")
         raise Exception(f"生成目录文档失败: {str(e)}")
 
-def generate_excel_stats(articles, journal) -> str:
+def generate_excel_stats(articles, journal, output_path: Optional[str] = None) -> str:
     """
     生成统计表Excel - 完全照搬参考代码实现
+    不指定 output_path 时按时间戳命名保存到 uploads/
     """
     try:
-        # 完全照搬参考代码的Excel生成逻辑
-        wb = Workbook()
-        ws = wb.active
-        ws.title = '校内'
-        headers = ['稿件号','页数','一作','通讯','刊期','是否东华大学']
-        ws.append([None])
-        ws.append(headers)
-
-        col_pos = {name: idx+1 for idx, name in enumerate(headers)}
-        r = 3
-        maxr = ws.max_row
-        if maxr >= r:
-            for row in ws.iter_rows(min_row=r, max_row=maxr):
-                for cell in row: cell.value = None
-
-        for a in articles:
-            values = {
-                '稿件号': _get(a, 'manuscript_id'),
-                '页数': _get(a, 'pdf_pages'),
-                '一作': _get(a, 'first_author'),
-                '通讯': (_get(a, 'corresponding') or ''),
-                '刊期': _get(a, 'issue'),
-                '是否东华大学': '是' if _get(a, 'is_dhu') else '否',
-            }
-            for k, v in values.items():
-                if k in col_pos:
-                    ws.cell(row=r, column=col_pos[k], value=v)
-            r += 1
-
         # 保存文件
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"统计表_{journal.issue}_{timestamp}.xlsx"
-        output_path = os.path.join('uploads', filename)
+        if output_path is None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f"统计表_{journal.issue}_{timestamp}.xlsx"
+            output_path = os.path.join('uploads', filename)
         
-        os.makedirs('uploads', exist_ok=True)
-        wb.save(output_path)
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        _save_atomic(lambda path: write_excel_stats(articles, path), output_path)
         
-        logger.info(f"统计表已生成: {output_path}")
+        logger.info("统计表已生成: %s", output_path)
         
-        # 记录生成的数据用于调试
-        debug_data = []
-        for a in articles:
-            debug_data.append({
-                '稿件号': _get(a, 'manuscript_id'),
-                '页数': _get(a, 'pdf_pages'),
-                '一作': _get(a, 'first_author'),
-                '通讯': (_get(a, 'corresponding') or ''),
-                '刊期': _get(a, 'issue'),
-                '是否东华大学': '是' if _get(a, 'is_dhu') else '否'
-            })
-        logger.info(f"生成的数据: {debug_data}")
+        # 调试时按采样输出生成的行；级别未开启时不会再遍历 articles
+        rows = RowSampler(logger)
+        if rows.enabled:
+            for a in articles:
+                rows.log(lambda row: ("统计表行", _stats_values(row)), a)
         
         return output_path
         
     except Exception as e:
         logger.error(f"生成统计表Excel失败: {str(e)}")
         raise Exception(f"生成统计表Excel失败: {str(e)}")
-
-
@@ -0,0 +1,70 @@
+import os
+import re
+import hashlib
+import logging
+from typing import Any, Optional
+
+from models import db, Paper
+from services.metrics import CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+# 导出文档格式版本：修改目录/统计表的生成逻辑时递增，使旧产物失效
+EXPORT_FORMAT_VERSION = 1
+
+def journal_export_version(journal: Any) -> str:
+    """
+    期刊导出版本号：由该期各篇论文的 (id, content_hash) 和期刊自身的刊期、更新时间派生，只执行一条查询。
+    论文的增、删、改（导入、upsert、重新提取都会重算 content_hash）、改挂期刊都会改变版本号；
+    不用 updated_at：MySQL DATETIME 精度为1秒，同一秒内的修改会得到相同的版本号
+    """
+    digest = hashlib.sha1(repr((EXPORT_FORMAT_VERSION, journal.id, journal.issue,
+                                journal.updated_at)).encode('utf-8'))
+    rows = db.session.query(Paper.id, Paper.content_hash).filter(
+        Paper.journal_id == journal.id).order_by(Paper.id)
+    for paper_id, paper_hash in rows:
+        digest.update(f"{paper_id}:{paper_hash}\n".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+def export_filename(prefix: str, journal: Any, version: str, ext: str) -> str:
+    """内容寻址的导出文件名：同一期刊同一版本总是得到同一个文件名"""
+    return f"{prefix}_{journal.issue}_j{journal.id}_{version}.{ext}"
+
+# export_filename 生成的文件名：..._j<期刊ID>_<16位版本号>.<扩展名>
+_CONTENT_ADDRESSED_RE = re.compile(r'_j(\d+)_[0-9a-f]{16}\.(docx|xlsx)$')
+
+def content_addressed_journal_id(filename: str) -> Optional[int]:
+    """内容寻址导出产物的期刊ID，其他文件返回None"""
+    m = _CONTENT_ADDRESSED_RE.search(filename)
+    return int(m.group(1)) if m else None
+
+def is_content_addressed(filename: str) -> bool:
+    """文件名中带内容版本号的导出产物：同名文件内容永不变化，可长期缓存"""
+    return content_addressed_journal_id(filename) is not None
+
+def find_cached_export(folder: str, filename: str) -> Optional[str]:
+    """命中返回已有产物路径"""
+    path = os.path.join(folder, filename)
+    if os.path.exists(path):
+        CACHE_LOOKUPS.inc(cache='export', result='hit')
+        logger.info(f"导出缓存命中: {filename}")
+        return path
+    CACHE_LOOKUPS.inc(cache='export', result='miss')
+    return None
+
+def purge_stale_exports(folder: str, prefix: str, journal: Any, ext: str, keep: str) -> int:
+    """删除同一期刊同一类导出的旧版本产物，返回删除个数"""
+    marker = f"_j{journal.id}_"
+    removed = 0
+    try:
+        names = os.listdir(folder)
+    except FileNotFoundError:
+        return 0
+    for name in names:
+        if name != keep and name.startswith(f"{prefix}_") and marker in name and name.endswith(f".{ext}"):
+            try:
+                os.remove(os.path.join(folder, name))
+                removed += 1
+            except OSError as e:
+                logger.warning(f"删除过期导出文件失败: {name}, {str(e)}")
+    return removed
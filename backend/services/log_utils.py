@@ -0,0 +1,100 @@
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+# 子系统 → 日志器名称，LOG_DEBUG=parser,export 只对这些子系统开启DEBUG
+SUBSYSTEM_LOGGERS = {
+    'http': ('app', '__main__'),
+    'parser': ('services.pdf_parser', 'services.parse_cache', 'services.parse_queue'),
+    'db': ('services.paper_store',),
+    'export': ('services.document_generator', 'services.export_cache'),
+    'sql': ('sqlalchemy.engine',),
+}
+
+# 逐行调试日志的采样间隔：每 N 行输出一条，0 表示完全关闭（不构造消息）
+DEFAULT_ROW_SAMPLE_EVERY = 100
+_row_sample_every = DEFAULT_ROW_SAMPLE_EVERY
+
+class TextFormatter(logging.Formatter):
+    """文本格式，附带的结构化字段以 key=value 追加在消息后"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        fields = getattr(record, 'fields', None)
+        if fields:
+            text += ' ' + ' '.join(f'{k}={v}' for k, v in fields.items())
+        return text
+
+class JsonFormatter(logging.Formatter):
+    """每条日志一行JSON，结构化字段合并到顶层"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        fields = getattr(record, 'fields', None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+def configure_logging(level: str = 'INFO', fmt: str = 'text', debug_subsystems: Iterable[str] = (),
+                      row_sample_every: int = DEFAULT_ROW_SAMPLE_EVERY) -> None:
+    """
+    配置根日志：level 为全局级别，fmt 为 text / json，
+    debug_subsystems 中的子系统（见 SUBSYSTEM_LOGGERS）单独开启DEBUG
+    """
+    global _row_sample_every
+    _row_sample_every = max(0, row_sample_every)
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter() if fmt == 'json' else TextFormatter())
+    root = logging.getLogger()
+    for old in list(root.handlers):
+        root.removeHandler(old)
+    root.addHandler(handler)
+    root.setLevel(getattr(logging, str(level).upper(), logging.INFO))
+
+    for name in debug_subsystems:
+        name = name.strip()
+        if not name:
+            continue
+        if name not in SUBSYSTEM_LOGGERS:
+            raise ValueError(f"未知的日志子系统: {name}，可选: {', '.join(SUBSYSTEM_LOGGERS)}")
+        for logger_name in SUBSYSTEM_LOGGERS[name]:
+            logging.getLogger(logger_name).setLevel(logging.DEBUG)
+
+class RowSampler:
+    """
+    逐行（每篇论文、每页）日志的采样器：每 every 行输出一条。
+    级别未开启或采样关闭时 log() 直接返回，不调用 build，不构造任何消息或字段。
+
+        rows = RowSampler(logger)
+        for paper in papers:
+            rows.log(lambda p: ("论文数据", {'doi': p.doi}), paper)
+    """
+
+    def __init__(self, logger: logging.Logger, every: Optional[int] = None, level: int = logging.DEBUG):
+        self.logger = logger
+        self.level = level
+        self.every = _row_sample_every if every is None else every
+        self.enabled = self.every > 0 and logger.isEnabledFor(level)
+        self.count = 0
+
+    def log(self, build: Callable[..., Tuple[str, Dict[str, Any]]], *args: Any) -> None:
+        if not self.enabled:
+            return
+        n = self.count
+        self.count += 1
+        if n % self.every:
+            return
+        msg, fields = build(*args)
+        self.logger.log(self.level, msg, extra={'fields': {'row': n, **fields}})
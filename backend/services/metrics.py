@@ -0,0 +1,219 @@
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# 进程内计数器/直方图，按 Prometheus 文本格式导出，不依赖 prometheus_client。
+# 多进程部署时每个工作进程各自统计，由抓取端按实例汇总。
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{_escape(extra[1])}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, '')) for n in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        lines.extend(self.samples())
+        return '\n'.join(lines)
+
+class Counter(_Metric):
+    """单调递增计数器"""
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}' for key, v in items]
+
+class Gauge(_Metric):
+    """可增可减的当前值"""
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}' for key, v in items]
+
+class Histogram(_Metric):
+    """固定分桶直方图，输出累计桶计数、_sum 和 _count，可在抓取端计算 p95"""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 每组标签: [各桶计数..., +Inf桶计数], 总和
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """计时上下文：with metric.time(stage='save'): ..."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        entry = self._values.get(self._key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._values.items())
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float('inf'),), counts):
+                cumulative += n
+                labels = _format_labels(self.labelnames, key, ('le', _format_value(bound)))
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"指标重复注册: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(m.render() for m in metrics) + '\n'
+
+REGISTRY = Registry()
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+def render_prometheus() -> str:
+    """全部指标的 Prometheus 文本格式（text/plain; version=0.0.4）"""
+    return REGISTRY.render()
+
+# ---- 指标定义：统一在此声明，各模块按名称导入使用 ----
+
+HTTP_REQUEST_SECONDS = histogram(
+    'journal_http_request_duration_seconds', '按路由统计的请求耗时', ('method', 'route', 'status'))
+
+UPLOAD_STAGE_SECONDS = histogram(
+    'journal_upload_stage_seconds', '上传处理各阶段耗时（每个文件一次）', ('stage',))
+
+PARSE_STAGE_SECONDS = histogram(
+    'journal_parse_stage_seconds', 'PDF解析各阶段累计耗时（每个文件一次）', ('stage', 'backend'))
+
+PDF_PAGES = counter(
+    'journal_pdf_pages_total', 'PDF页数：scanned 为全部页，prefiltered 为预筛选跳过，matched 为识别出的文章首页',
+    ('result',))
+
+EXPORT_STAGE_SECONDS = histogram(
+    'journal_export_stage_seconds', '导出文档生成各阶段耗时', ('kind', 'stage'))
+
+EXPORT_BYTES = histogram(
+    'journal_export_size_bytes', '导出文档大小', ('kind',), buckets=SIZE_BUCKETS)
+
+EXPORT_ROWS = counter(
+    'journal_export_rows_total', '写入导出文档的论文条数', ('kind',))
+
+CACHE_LOOKUPS = counter(
+    'journal_cache_lookups_total', '解析结果缓存与导出缓存的命中情况', ('cache', 'result'))
+
+STORAGE_BYTES = gauge(
+    'journal_storage_bytes', '上传目录占用：sources 为源文件，offprints 为单篇抽印本，exports 为生成的导出产物，incoming 为进行中的分块上传', ('kind',))
+
+STORAGE_RECLAIMED_BYTES = counter(
+    'journal_storage_reclaimed_bytes_total', '存储清理回收的字节数', ('reason',))
+
+SCHED_QUEUE_WAIT_SECONDS = histogram(
+    'journal_sched_queue_wait_seconds', 'CPU密集任务等待计算槽的时间（每个任务一次）', ('job_class',))
+
+SCHED_RUN_SECONDS = histogram(
+    'journal_sched_run_seconds', 'CPU密集任务占用计算槽的时间（每个任务一次）', ('job_class',))
+
+SCHED_QUEUE_DEPTH = gauge(
+    'journal_sched_queue_depth', '已受理但尚未开始运行的CPU密集任务数', ('job_class',))
+
+SCHED_SLOTS_BUSY = gauge(
+    'journal_sched_slots_busy', '正在使用的计算槽数')
+
+SCHED_REJECTED = counter(
+    'journal_sched_rejected_total', '排队已满被拒绝（返回429）的任务数', ('job_class',))
@@ -0,0 +1,153 @@
+import os
+import logging
+import tempfile
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 每个拆分任务（一次进程间提交）最多覆盖的源PDF页数
+DEFAULT_CHUNK_PAGES = 64
+
+# 一篇抽印本：(起始页序号, 结束页序号(不含), 输出路径)
+OffprintTask = Tuple[int, int, str]
+
+def tracking_page_indexes(records: Iterable[Dict[str, Any]], page_indexes: List[Optional[int]]) -> Iterator[Dict[str, Any]]:
+    """透传记录的同时按顺序收集每篇文章首页的页序号，流式入库时不必保留整份记录"""
+    for record in records:
+        page_indexes.append(record.get('page_index'))
+        yield record
+
+def article_ranges(page_indexes: List[Optional[int]], n_pages: int) -> List[Optional[Tuple[int, int]]]:
+    """
+    每篇文章的页码范围 [首页, 下一篇首页)，最后一篇到文档末尾。
+    首页序号未知（旧版本缓存的解析结果）的文章返回None，不拆分
+    """
+    starts = sorted({pi for pi in page_indexes if pi is not None and 0 <= pi < n_pages})
+    ranges: List[Optional[Tuple[int, int]]] = []
+    for pi in page_indexes:
+        if pi is None or not 0 <= pi < n_pages:
+            ranges.append(None)
+            continue
+        i = bisect_right(starts, pi)
+        ranges.append((pi, starts[i] if i < len(starts) else n_pages))
+    return ranges
+
+class _Splitter:
+    """
+    以文件流打开源PDF（按需读取对象，不整体载入内存），依次写出抽印本。
+    reader 在整个进程内复用，页树只展开一次；每写完一篇就丢弃为它解析出的对象
+    （内容流、图片等），已解析对象的缓存不随已拆分的页数增长
+    """
+
+    def __init__(self, pdf_path: str):
+        from PyPDF2 import PdfReader
+        self._fp = open(pdf_path, 'rb')
+        self.reader = PdfReader(self._fp)
+        self.n_pages = len(self.reader.pages)
+        self._baseline = set(self.reader.resolved_objects)
+
+    def write(self, start: int, stop: int, out_path: str) -> int:
+        """把 [start, stop) 页复制到新PDF，先写临时文件再原子替换，返回页数"""
+        from PyPDF2 import PdfWriter
+        try:
+            writer = PdfWriter()
+            for pi in range(start, stop):
+                writer.add_page(self.reader.pages[pi])
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(out_path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    writer.write(f)
+                os.replace(tmp_path, out_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        finally:
+            cache = self.reader.resolved_objects
+            for key in [k for k in cache if k not in self._baseline]:
+                del cache[key]
+        return stop - start
+
+    def split(self, tasks: List[OffprintTask]) -> List[Optional[int]]:
+        """依次写出抽印本，返回每篇的页数，失败的为None"""
+        pages: List[Optional[int]] = []
+        for start, stop, out_path in tasks:
+            try:
+                pages.append(self.write(start, stop, out_path))
+            except Exception as e:
+                logger.error(f"拆分抽印本失败: {out_path}, {str(e)}")
+                pages.append(None)
+        return pages
+
+    def close(self) -> None:
+        self._fp.close()
+
+# 工作进程内复用的拆分器，由进程池的 initializer 创建
+_worker_splitter: Optional[_Splitter] = None
+
+def _init_worker(pdf_path: str) -> None:
+    global _worker_splitter
+    _worker_splitter = _Splitter(pdf_path)
+
+def _split_chunk(tasks: List[OffprintTask]) -> List[Optional[int]]:
+    """进程池工作函数：用本进程的拆分器写出分配到的一组抽印本"""
+    return _worker_splitter.split(tasks)
+
+def _chunk_tasks(tasks: List[OffprintTask], chunk_pages: int) -> List[List[OffprintTask]]:
+    """按页数把连续的抽印本分组，每组至少一篇"""
+    chunks, current, size = [], [], 0
+    for task in tasks:
+        if current and size + task[1] - task[0] > chunk_pages:
+            chunks.append(current)
+            current, size = [], 0
+        current.append(task)
+        size += task[1] - task[0]
+    if current:
+        chunks.append(current)
+    return chunks
+
+def split_offprints(pdf_path: str, page_indexes: List[Optional[int]], out_paths: List[str],
+                    workers: int = 0, chunk_pages: int = DEFAULT_CHUNK_PAGES) -> List[Optional[int]]:
+    """
+    按文章首页序号把整期PDF拆成单篇抽印本，写到 out_paths（与 page_indexes 一一对应，
+    为None的文章不拆分，但其首页仍作为前一篇的边界），返回每篇的真实页数，未拆分或失败的为None。
+
+    抽印本按 chunk_pages 页分组提交，减少进程间通信；workers > 1 时由进程池并行拆分，
+    每个工作进程自行打开一次源文件；进程池异常时未完成的分组回退到当前进程串行拆分
+    """
+    splitter = _Splitter(pdf_path)
+    try:
+        n_pages = splitter.n_pages
+        ranges = article_ranges(page_indexes, n_pages)
+        slots = [k for k, r in enumerate(ranges) if r is not None and out_paths[k] is not None]
+        tasks = [(ranges[k][0], ranges[k][1], out_paths[k]) for k in slots]
+        chunks = _chunk_tasks(tasks, chunk_pages)
+
+        results: List[Optional[List[Optional[int]]]] = [None] * len(chunks)
+        if workers > 1 and len(chunks) > 1:
+            executor = ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                           initializer=_init_worker, initargs=(pdf_path,))
+            try:
+                futures = [executor.submit(_split_chunk, chunk) for chunk in chunks]
+                for i, future in enumerate(futures):
+                    try:
+                        results[i] = future.result()
+                    except BrokenProcessPool as pool_error:
+                        logger.warning(f"进程池异常，剩余抽印本回退到串行拆分: {str(pool_error)}")
+                        break
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+        for i, chunk in enumerate(chunks):
+            if results[i] is None:
+                results[i] = splitter.split(chunk)
+    finally:
+        splitter.close()
+
+    pages: List[Optional[int]] = [None] * len(page_indexes)
+    for k, n in zip(slots, (n for chunk_result in results for n in chunk_result)):
+        pages[k] = n
+    logger.info(f"拆分抽印本 {sum(1 for n in pages if n)}/{len(page_indexes)} 篇, "
+                f"{len(chunks)} 个分组, 源文件 {n_pages} 页")
+    return pages
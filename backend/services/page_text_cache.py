@@ -0,0 +1,111 @@
+import os
+import gzip
+import json
+import logging
+import tempfile
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 页面文本是高度冗余的自然语言，压缩级别取中间值即可，再高收益很小
+COMPRESS_LEVEL = 6
+
+class PageTextWriter:
+    """
+    边提取边写入一个文件的页面文本，内存中不保留已写入的页面。
+    提供与列表相同的 append / extend，可直接作为 iter_pdf_papers 的 page_texts 参数；
+    全部写完后调用 commit(总页数) 落盘，未 commit 的临时文件由 PageTextCache.writer 丢弃
+    """
+
+    def __init__(self, f):
+        self._f = f
+        self.committed = False
+
+    def append(self, item: Tuple[int, str]) -> None:
+        pi, text = item
+        self._f.write(json.dumps({'p': pi, 't': text}, ensure_ascii=False))
+        self._f.write('\n')
+
+    def extend(self, items: Iterable[Tuple[int, str]]) -> None:
+        for item in items:
+            self.append(item)
+
+    def commit(self, n_pages: int) -> None:
+        self._f.write(json.dumps({'n_pages': n_pages}))
+        self._f.write('\n')
+        self.committed = True
+
+class PageTextCache:
+    """
+    逐页文本缓存 - 以文件内容的SHA-256和页码为键，保存文本提取后端（pdfplumber 等）的输出
+
+    文件格式为 gzip 压缩的 JSON Lines：每行 {"p": 页号, "t": 文本}，末行 {"n_pages": 总页数}
+    （早期版本写在首行，读取时两种都接受；缺少这一行视为文件不完整）。
+    只保存完整提取过文本的页面；预筛选跳过的页面不含"DOI"，字段提取对它们一定返回空，无需保存。
+    与解析结果缓存不同，文件名不带解析器版本号：提取规则更新后正是靠这份文本重新提取字段，
+    只有换文本提取后端时才需要重新读取PDF。
+    """
+
+    def __init__(self, folder: str, backend: str):
+        self.folder = folder
+        self.backend = backend
+
+    def _path(self, file_hash: str) -> str:
+        return os.path.join(self.folder, f"{file_hash}.{self.backend}.pages.jsonl.gz")
+
+    def has(self, file_hash: Optional[str]) -> bool:
+        return bool(file_hash) and os.path.exists(self._path(file_hash))
+
+    def load(self, file_hash: Optional[str]) -> Optional[Tuple[int, List[Tuple[int, str]]]]:
+        """命中返回 (总页数, [(页号, 文本), ...])，未命中或文件损坏返回None"""
+        if not file_hash:
+            return None
+        try:
+            with gzip.open(self._path(file_hash), 'rt', encoding='utf-8') as f:
+                n_pages, pages = None, []
+                for line in f:
+                    if line.strip():
+                        item = json.loads(line)
+                        if 'n_pages' in item:
+                            n_pages = item['n_pages']
+                        else:
+                            pages.append((item['p'], item['t']))
+            if n_pages is None:
+                raise ValueError('缺少总页数')
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError, KeyError) as e:
+            logger.warning(f"页面文本缓存损坏，忽略: {file_hash[:12]}, {str(e)}")
+            return None
+        return n_pages, pages
+
+    @contextmanager
+    def writer(self, file_hash: Optional[str]) -> Iterator[Optional[PageTextWriter]]:
+        """
+        流式写入一个文件的页面文本：with cache.writer(哈希) as pages: ...; pages.commit(总页数)。
+        先写临时文件，commit 后退出时原子替换，避免并发读到半个文件；中途出错或未 commit 丢弃临时文件。
+        没有文件哈希时得到 None，调用方据此不收集页面文本
+        """
+        if not file_hash:
+            yield None
+            return
+        os.makedirs(self.folder, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.folder, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as raw, \
+                    gzip.open(raw, 'wt', encoding='utf-8', compresslevel=COMPRESS_LEVEL) as f:
+                pages = PageTextWriter(f)
+                yield pages
+            if pages.committed:
+                os.replace(tmp_path, self._path(file_hash))
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def save(self, file_hash: Optional[str], n_pages: int, pages: Iterable[Tuple[int, str]]) -> None:
+        """写入一个文件的页面文本"""
+        with self.writer(file_hash) as writer:
+            if writer is not None:
+                writer.extend(pages)
+                writer.commit(n_pages)
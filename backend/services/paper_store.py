@@ -0,0 +1,311 @@
+import json
+import time
+import hashlib
+import logging
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+from sqlalchemy import case, delete, func, insert, select, update
+
+from models import Author, Paper, PaperAuthor
+
+logger = logging.getLogger(__name__)
+
+# 解析得到的内容字段：内容哈希只覆盖这些字段，源文件路径变化不算内容变化
+_EXTRACTED_FIELDS = ('title', 'authors', 'abstract', 'keywords', 'doi', 'page_start', 'page_end',
+                     'manuscript_id', 'pdf_pages', 'first_author', 'corresponding', 'issue', 'is_dhu')
+# upsert 命中已有论文时更新的列（另加 content_hash）；journal_id 和 created_at 保持不变
+_UPSERT_COLUMNS = _EXTRACTED_FIELDS + ('file_path', 'updated_at')
+
+def content_hash(row: Dict[str, Any]) -> str:
+    """论文内容字段的SHA-1，用于判断重新导入的记录是否有变化"""
+    payload = json.dumps([row[f] for f in _EXTRACTED_FIELDS], ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def paper_row(journal, record: Dict[str, Any], file_path: str) -> Dict[str, Any]:
+    """把解析记录映射为 papers 表的一行"""
+    now = datetime.utcnow()
+    row = {
+        'journal_id': journal.id,
+        'title': record.get('title', ''),
+        'authors': record.get('authors', ''),
+        'abstract': record.get('abstract', ''),
+        'keywords': record.get('keywords', ''),
+        # 没有DOI时存NULL：DOI有唯一约束，NULL不参与冲突判断
+        'doi': record.get('doi') or None,
+        'page_start': record.get('page_start'),
+        'page_end': record.get('page_end'),
+        'file_path': file_path,
+        # 统计表字段
+        'manuscript_id': record.get('manuscript_id', ''),
+        'pdf_pages': record.get('pdf_pages', 0),
+        'first_author': record.get('first_author', ''),
+        'corresponding': record.get('corresponding', ''),
+        'issue': record.get('issue', journal.issue),
+        'is_dhu': record.get('is_dhu', False),
+        'created_at': now,
+        'updated_at': now,
+    }
+    row['content_hash'] = content_hash(row)
+    return row
+
+def split_author_names(authors: str) -> List[str]:
+    """拆分规范化后的作者串 "HUANG Jiacui, ZHAO Mingbo" """
+    return [name.strip() for name in (authors or '').split(',') if name.strip()]
+
+def _batches(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    it = iter(items)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+class AuthorIndex:
+    """
+    作者姓名 → id 的内存索引，跨批次复用，同一姓名只查询/插入一次。
+    authors 表的 name 没有唯一约束，已有重名记录时取最小id。
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.ids: Dict[str, int] = {}
+
+    def resolve(self, names: Iterable[str]) -> Dict[str, int]:
+        missing = {n for n in names if n not in self.ids}
+        if missing:
+            self._load(missing)
+            new_names = [n for n in missing if n not in self.ids]
+            if new_names:
+                now = datetime.utcnow()
+                self.session.execute(insert(Author), [
+                    {'name': n, 'name_en': n, 'created_at': now, 'updated_at': now}
+                    for n in new_names
+                ])
+                self._load(new_names)
+        return self.ids
+
+    def _load(self, names: Iterable[str]) -> None:
+        rows = self.session.execute(
+            select(Author.name, func.min(Author.id))
+            .where(Author.name.in_(list(names)))
+            .group_by(Author.name)
+        )
+        self.ids.update({name: author_id for name, author_id in rows})
+
+def _insert_author_links(session, author_index: AuthorIndex, paper_ids: List[int],
+                         rows: List[Dict[str, Any]]) -> None:
+    """按论文行的作者串写入 paper_authors，paper_ids 与 rows 一一对应"""
+    names_per_paper = [split_author_names(row['authors']) for row in rows]
+    name_ids = author_index.resolve({n for names in names_per_paper for n in names})
+    links = []
+    for paper_id, row, names in zip(paper_ids, rows, names_per_paper):
+        for order, name in enumerate(names, start=1):
+            links.append({
+                'paper_id': paper_id,
+                'author_id': name_ids[name],
+                'author_order': order,
+                'is_corresponding': bool(row['corresponding']) and name == row['corresponding'],
+            })
+    if links:
+        session.execute(insert(PaperAuthor), links)
+
+def bulk_insert_papers(session, journal, records: Iterable[Dict[str, Any]], file_path: str,
+                       batch_size: int = 200, with_authors: bool = True,
+                       stats: Optional[Dict[str, Any]] = None) -> int:
+    """
+    分批以多行INSERT写入论文（不提交），并按作者列表填充 authors / paper_authors，返回写入条数
+
+    records 可以是生成器，每次只在内存中保留一个批次。
+    传入 stats 字典时写入 db_seconds：只计数据库语句耗时，不含从生成器取记录（即解析）的时间。
+    MySQL 不支持 INSERT ... RETURNING，新论文的id通过 (journal_id, file_path, id > 水位) 回查，
+    按id排序即为插入顺序。
+    """
+    author_index = AuthorIndex(session) if with_authors else None
+    total = 0
+    db_seconds = 0.0
+    for batch in _batches(records, batch_size):
+        batch_start = time.perf_counter()
+        rows = [paper_row(journal, record, file_path) for record in batch]
+        watermark = session.execute(select(func.max(Paper.id))).scalar() or 0
+        session.execute(insert(Paper), rows)
+        total += len(rows)
+
+        if author_index is None:
+            db_seconds += time.perf_counter() - batch_start
+            continue
+
+        paper_ids = session.execute(
+            select(Paper.id)
+            .where(Paper.journal_id == journal.id, Paper.file_path == file_path, Paper.id > watermark)
+            .order_by(Paper.id)
+        ).scalars().all()
+        if len(paper_ids) != len(rows):
+            raise RuntimeError(f"论文回查数量不一致: 插入 {len(rows)} 条, 查到 {len(paper_ids)} 条")
+
+        _insert_author_links(session, author_index, paper_ids, rows)
+        db_seconds += time.perf_counter() - batch_start
+
+    if stats is not None:
+        stats['db_seconds'] = db_seconds
+    logger.info(f"批量写入论文 {total} 篇")
+    return total
+
+def _link_changed_authors(session, author_index: AuthorIndex, paper_ids: List[int],
+                          rows: List[Dict[str, Any]]) -> None:
+    """作者或通讯作者有变化的已有论文：删除旧的 paper_authors 后按新作者串重建"""
+    session.execute(delete(PaperAuthor).where(PaperAuthor.paper_id.in_(paper_ids)))
+    _insert_author_links(session, author_index, paper_ids, rows)
+
+def _upsert_statement(dialect: str):
+    """
+    按DOI唯一键的 upsert 语句：新DOI插入，已有DOI且内容哈希不同的更新内容字段，
+    哈希相同的不写（归属期刊和创建时间不变）。不支持的数据库返回None。
+    以 executemany 方式执行：语句可被缓存，驱动把整批参数合并成一条多行 INSERT 发送
+    """
+    if dialect == 'mysql':
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        stmt = mysql_insert(Paper)
+        same = Paper.content_hash == stmt.inserted.content_hash
+        # MySQL 按书写顺序赋值：content_hash 必须放在最后，前面的比较才能看到旧值
+        assignments = [(c, case((same, getattr(Paper, c)), else_=stmt.inserted[c])) for c in _UPSERT_COLUMNS]
+        assignments.append(('content_hash', stmt.inserted.content_hash))
+        return stmt.on_duplicate_key_update(assignments)
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(Paper)
+        return stmt.on_conflict_do_update(
+            index_elements=[Paper.doi],
+            set_={c: stmt.excluded[c] for c in _UPSERT_COLUMNS + ('content_hash',)},
+            where=Paper.content_hash.is_distinct_from(stmt.excluded.content_hash)
+        )
+    return None
+
+def upsert_papers(session, journal, records: Iterable[Dict[str, Any]], file_path: str,
+                  batch_size: int = 200, with_authors: bool = True,
+                  stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    按DOI分批增量写入论文（不提交）：新文章插入，内容有变化的更新，内容相同的不产生任何写入。
+    返回 {'inserted', 'updated', 'unchanged', 'duplicate': 各类条数,
+          'paper_ids': 与记录一一对应的论文id（同一文件内重复的DOI为None）,
+          'changed_ids': 插入或更新过的论文id集合,
+          'matched_journal_ids': 已有论文所属的期刊id集合}
+
+    每批先用一条 SELECT 取出已有DOI的内容哈希，再把新增和有变化的行合并成一条
+    upsert 语句（MySQL 为 INSERT ... ON DUPLICATE KEY UPDATE，SQLite/PostgreSQL 为
+    INSERT ... ON CONFLICT DO UPDATE），最后回查新行的id。已有论文保留原来的期刊归属。
+    stats 的 db_seconds 含义同 bulk_insert_papers。
+    """
+    upsert = _upsert_statement(session.get_bind().dialect.name)
+    author_index = AuthorIndex(session) if with_authors else None
+    result = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'duplicate': 0,
+              'paper_ids': [], 'changed_ids': set(), 'matched_journal_ids': set()}
+    seen = set()
+    db_seconds = 0.0
+    for batch in _batches(records, batch_size):
+        batch_start = time.perf_counter()
+        rows = [paper_row(journal, record, file_path) for record in batch]
+        dois = [row['doi'] for row in rows if row['doi']]
+        existing = {}
+        if dois:
+            existing = {old.doi: old for old in session.execute(
+                select(Paper.id, Paper.doi, Paper.journal_id, Paper.content_hash,
+                       Paper.authors, Paper.corresponding)
+                .where(Paper.doi.in_(dois)))}
+
+        ids: List[Optional[int]] = [None] * len(rows)
+        new, changed, no_doi = [], [], []
+        for k, row in enumerate(rows):
+            doi = row['doi']
+            if not doi:
+                no_doi.append(k)
+                continue
+            if doi in seen:
+                result['duplicate'] += 1
+                logger.warning(f"同一文件中DOI重复，跳过: {doi}")
+                continue
+            seen.add(doi)
+            old = existing.get(doi)
+            if old is None:
+                new.append(k)
+                continue
+            ids[k] = old.id
+            result['matched_journal_ids'].add(old.journal_id)
+            if old.content_hash == row['content_hash']:
+                result['unchanged'] += 1
+            else:
+                changed.append(k)
+
+        if new or changed:
+            if upsert is not None:
+                session.execute(upsert, [rows[k] for k in new + changed])
+            else:
+                if new:
+                    session.execute(insert(Paper), [rows[k] for k in new])
+                if changed:
+                    session.execute(update(Paper), [
+                        dict({c: rows[k][c] for c in _UPSERT_COLUMNS + ('content_hash',)}, id=ids[k])
+                        for k in changed
+                    ])
+        if new:
+            new_ids = dict(session.execute(
+                select(Paper.doi, Paper.id).where(Paper.doi.in_([rows[k]['doi'] for k in new]))).all())
+            for k in new:
+                ids[k] = new_ids[rows[k]['doi']]
+        # 没有DOI的记录无法去重，逐条插入
+        for k in no_doi:
+            ids[k] = session.execute(insert(Paper).values(rows[k])).inserted_primary_key[0]
+        inserted = new + no_doi
+
+        if author_index is not None:
+            if inserted:
+                _insert_author_links(session, author_index, [ids[k] for k in inserted], [rows[k] for k in inserted])
+            relink = [k for k in changed
+                      if (existing[rows[k]['doi']].authors, existing[rows[k]['doi']].corresponding)
+                      != (rows[k]['authors'], rows[k]['corresponding'])]
+            if relink:
+                _link_changed_authors(session, author_index, [ids[k] for k in relink], [rows[k] for k in relink])
+
+        result['inserted'] += len(inserted)
+        result['updated'] += len(changed)
+        result['changed_ids'].update(ids[k] for k in inserted + changed)
+        result['paper_ids'].extend(ids)
+        db_seconds += time.perf_counter() - batch_start
+
+    if stats is not None:
+        stats['db_seconds'] = db_seconds
+    logger.info(f"按DOI写入论文: 新增 {result['inserted']} 篇, 更新 {result['updated']} 篇, "
+                f"未变 {result['unchanged']} 篇")
+    return result
+
+def update_papers_from_records(session, journal, file_path: str, records: Iterable[Dict[str, Any]],
+                               batch_size: int = 200) -> Dict[str, Any]:
+    """
+    用重新提取的记录更新某个源文件的论文（不提交）：按DOI upsert，
+    之后该文件名下不再出现的论文（规则修正后不再识别为文章，或DOI改变）删除。
+    返回 upsert_papers 的结果，另加 'deleted' 条数
+    """
+    result = upsert_papers(session, journal, records, file_path, batch_size)
+    keep = {pid for pid in result['paper_ids'] if pid is not None}
+    stale = [pid for pid in session.execute(
+        select(Paper.id).where(Paper.journal_id == journal.id, Paper.file_path == file_path)
+    ).scalars() if pid not in keep]
+    for batch in _batches(stale, batch_size):
+        session.execute(delete(PaperAuthor).where(PaperAuthor.paper_id.in_(batch)))
+        session.execute(delete(Paper).where(Paper.id.in_(batch)))
+    result['deleted'] = len(stale)
+    return result
+
+def set_offprints(session, paper_ids: List[int], offprints: List[Optional[Dict[str, Any]]],
+                  batch_size: int = 200) -> int:
+    """记录论文的抽印本路径和页数（不提交），offprints 与 paper_ids 一一对应，None 跳过；返回更新条数"""
+    now = datetime.utcnow()
+    rows = [dict(offprint, id=paper_id, updated_at=now)
+            for paper_id, offprint in zip(paper_ids, offprints) if offprint is not None]
+    for batch in _batches(rows, batch_size):
+        session.execute(update(Paper), batch)
+    return len(rows)
@@ -0,0 +1,68 @@
+import os
+import json
+import logging
+import tempfile
+from typing import Dict, Any, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+class ParseResultCache:
+    """
+    PDF解析结果缓存 - 以文件内容的SHA-256为键，保存 parse_pdf_to_papers 的输出
+
+    每条记录占一行(JSON Lines)，读写都是流式的，不需要把整份结果放进内存。
+    缓存文件名带解析器版本号，提取规则变化后旧缓存自然失效。
+    """
+
+    def __init__(self, folder: str, version: str):
+        self.folder = folder
+        self.version = version
+
+    def _path(self, file_hash: str) -> str:
+        return os.path.join(self.folder, f"{file_hash}.v{self.version}.jsonl")
+
+    def get(self, file_hash: Optional[str]) -> Optional[Iterator[Dict[str, Any]]]:
+        """命中返回逐条读取记录的迭代器，未命中返回None"""
+        if not file_hash:
+            return None
+        path = self._path(file_hash)
+        try:
+            f = open(path, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return None
+        logger.info(f"解析缓存命中: {file_hash[:12]}")
+        return self._read(f)
+
+    @staticmethod
+    def _read(f) -> Iterator[Dict[str, Any]]:
+        with f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def recording(self, file_hash: Optional[str],
+                  records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        透传 records 的同时写入缓存。只有完整迭代结束且结果非空时才落盘，
+        中途出错或提前停止都会丢弃临时文件，避免缓存残缺或失败的结果。
+        """
+        if not file_hash:
+            yield from records
+            return
+
+        os.makedirs(self.folder, exist_ok=True)
+        # 先写临时文件再原子替换，避免并发读到半个文件
+        fd, tmp_path = tempfile.mkstemp(dir=self.folder, suffix='.tmp')
+        count = 0
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False))
+                    f.write('\n')
+                    count += 1
+                    yield record
+            if count:
+                os.replace(tmp_path, self._path(file_hash))
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -0,0 +1,81 @@
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from typing import Callable, Deque, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+class ParseJobQueue:
+    """
+    进程内后台解析任务队列 - 基于线程池，不依赖外部消息中间件
+
+    任务的持久状态由调用方写入 FileUpload.upload_status，
+    这里只在内存中记录排队/运行情况和失败原因，供状态查询接口补充返回。
+    结束（完成或失败）的任务保留 retention 秒，且最多保留 max_finished 个，超出的按结束先后淘汰；
+    淘汰后状态查询只返回数据库中的状态。
+    """
+
+    def __init__(self, max_workers: int = 2, retention: float = 3600, max_finished: int = 1000):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='parse-job')
+        self._lock = threading.Lock()
+        self._jobs: Dict[int, Dict[str, Any]] = {}
+        self.retention = retention
+        self.max_finished = max_finished
+        # 已结束任务的id，按结束先后排列
+        self._finished: Deque[int] = deque()
+
+    def submit(self, job_id: int, fn: Callable[..., Any], *args: Any, ticket: Any = None) -> None:
+        """提交任务，立即返回；ticket 为任务的CPU调度凭据，状态查询时据此报告等待计算槽的时间"""
+        with self._lock:
+            self._jobs[job_id] = {
+                'state': 'queued',
+                'error': None,
+                'submitted_at': time.time(),
+                'started_at': None,
+                'finished_at': None,
+                'ticket': ticket,
+            }
+        self._executor.submit(self._run, job_id, fn, args)
+        logger.info(f"解析任务已入队: {job_id}")
+
+    def _run(self, job_id: int, fn: Callable[..., Any], args: tuple) -> None:
+        self._update(job_id, state='running', started_at=time.time())
+        try:
+            fn(*args)
+            self._update(job_id, state='done', finished_at=time.time())
+        except Exception as e:
+            logger.error(f"解析任务 {job_id} 失败: {str(e)}")
+            self._update(job_id, state='failed', error=str(e), finished_at=time.time())
+        with self._lock:
+            self._finished.append(job_id)
+            self._evict(time.time())
+
+    def _update(self, job_id: int, **fields: Any) -> None:
+        with self._lock:
+            self._jobs.setdefault(job_id, {}).update(fields)
+
+    def _evict(self, now: float) -> None:
+        """淘汰超过保留时间或超出数量上限的已结束任务（调用方持有锁）"""
+        while self._finished:
+            job_id = self._finished[0]
+            job = self._jobs.get(job_id)
+            # 同一id重新提交后又在运行中，旧的结束记录作废
+            if job is None or job.get('finished_at') is None:
+                self._finished.popleft()
+                continue
+            if len(self._finished) <= self.max_finished and now - job['finished_at'] < self.retention:
+                break
+            self._finished.popleft()
+            del self._jobs[job_id]
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """返回任务的内存状态快照，未知任务返回None"""
+        with self._lock:
+            self._evict(time.time())
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,43 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+logger = logging.getLogger(__name__)
+
+class VerifierBusy(RuntimeError):
+    """等待校验的登录请求已达上限"""
+
+    def __init__(self, pending: int, retry_after: int = 1):
+        super().__init__(f"登录请求过多（{pending} 个等待校验），请稍后重试")
+        self.pending = pending
+        self.retry_after = retry_after
+
+class PasswordVerifier:
+    """
+    在固定大小的线程池中执行 bcrypt 校验。
+
+    bcrypt.checkpw 每次约 250ms CPU（执行期间释放GIL），开学时集中登录若在请求线程里直接计算，
+    会同时占满所有核，其他接口一起变慢。这里最多 max_workers 个校验同时进行，
+    另有最多 max_pending 个排队，再多直接拒绝（接口返回429），请求线程不会无限堆积。
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 32):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='bcrypt')
+        self._slots = threading.BoundedSemaphore(max(1, max_workers) + max(0, max_pending))
+        self.max_pending = max_pending
+
+    def check(self, password: str, password_hash: str) -> bool:
+        """校验密码，阻塞到结果返回；排队已满抛出 VerifierBusy"""
+        if not self._slots.acquire(blocking=False):
+            logger.warning("登录校验排队已满，拒绝请求")
+            raise VerifierBusy(self.max_pending)
+        try:
+            future = self._executor.submit(bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
+            return future.result()
+        finally:
+            self._slots.release()
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
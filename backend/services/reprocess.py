@@ -0,0 +1,94 @@
+import os
+import time
+import hashlib
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import func, select
+
+from models import FileUpload, Paper
+from services.page_text_cache import PageTextCache
+from services.paper_store import update_papers_from_records
+from services.pdf_parser import iter_pdf_papers, records_from_page_texts, DEFAULT_BACKEND
+
+logger = logging.getLogger(__name__)
+
+def _file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+def _page_texts(upload, page_cache: PageTextCache, prefilter: bool, backend: str) -> Optional[Dict[str, Any]]:
+    """
+    取一个源文件的逐页文本：优先读缓存；缓存缺失（缓存功能上线前导入的文件）且源文件还在时
+    重新提取一次并写入缓存。都没有返回None
+    """
+    cached = page_cache.load(upload.file_hash)
+    if cached is not None:
+        return {'source': 'cache', 'n_pages': cached[0], 'pages': cached[1]}
+    if not os.path.isfile(upload.upload_path):
+        return None
+    if not upload.file_hash:
+        # 内容哈希列上线前的上传记录：补算哈希（随重新提取一起提交），页面文本缓存以它为键
+        upload.file_hash = _file_sha256(upload.upload_path)
+    # 逐页文本边提取边写入缓存，不在内存中收集，写完再读回
+    stats = {}
+    with page_cache.writer(upload.file_hash) as pages:
+        for _ in iter_pdf_papers(upload.upload_path, prefilter=prefilter, stats=stats,
+                                 backend=backend, page_texts=pages):
+            pass
+        if pages is not None:
+            pages.commit(stats['pages'])
+    cached = page_cache.load(upload.file_hash)
+    if cached is None:
+        return None
+    return {'source': 'pdf', 'n_pages': cached[0], 'pages': cached[1]}
+
+def reprocess_journal(session, journal, page_cache: PageTextCache, parse_cache=None,
+                      prefilter: bool = True, backend: str = DEFAULT_BACKEND,
+                      batch_size: int = 200, split: Optional[Callable] = None) -> Dict[str, Any]:
+    """
+    对一期期刊的PDF源文件重新运行字段提取并更新论文（不提交），返回逐文件的结果。
+
+    只处理已有论文入库的源文件：内容重复而被跳过解析的上传记录保持原样，不会因重新提取而多出论文。
+    传入 parse_cache 时用新结果覆盖该文件的解析结果缓存，之后相同内容的上传直接使用新规则的结果。
+    传入 split 时调用 split(源文件路径, 各文章首页序号, upsert结果)，为插入或更新过的论文重新拆分抽印本。
+    """
+    uploads = session.execute(
+        select(FileUpload)
+        .where(FileUpload.journal_id == journal.id, FileUpload.file_type == 'pdf',
+               FileUpload.upload_status == 'completed')
+        .order_by(FileUpload.id)
+    ).scalars().all()
+    paper_counts = dict(session.execute(
+        select(Paper.file_path, func.count(Paper.id))
+        .where(Paper.journal_id == journal.id)
+        .group_by(Paper.file_path)
+    ).all())
+
+    files: List[Dict[str, Any]] = []
+    for upload in uploads:
+        item = {'fileId': upload.id, 'filename': upload.original_filename}
+        files.append(item)
+        if not paper_counts.get(upload.upload_path):
+            item['status'] = 'not_imported'
+            continue
+        start = time.perf_counter()
+        texts = _page_texts(upload, page_cache, prefilter, backend)
+        if texts is None:
+            item['status'] = 'missing'
+            logger.warning(f"源文件和页面文本缓存都不存在，无法重新提取: {upload.upload_path}")
+            continue
+        records = list(records_from_page_texts(texts['pages'], upload.upload_path, texts['n_pages']))
+        written = update_papers_from_records(session, journal, upload.upload_path, records, batch_size)
+        if split is not None and os.path.isfile(upload.upload_path):
+            split(upload.upload_path, [r.get('page_index') for r in records], written)
+        if parse_cache is not None and records:
+            for _ in parse_cache.recording(upload.file_hash, iter(records)):
+                pass
+        item.update({k: written[k] for k in ('updated', 'unchanged', 'inserted', 'deleted')},
+                    status='reprocessed', textSource=texts['source'],
+                    seconds=round(time.perf_counter() - start, 3))
+    return {'journalId': journal.id, 'files': files}
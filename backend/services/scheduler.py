@@ -0,0 +1,188 @@
+import math
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from services.metrics import (SCHED_QUEUE_WAIT_SECONDS, SCHED_RUN_SECONDS, SCHED_QUEUE_DEPTH,
+                              SCHED_SLOTS_BUSY, SCHED_REJECTED)
+
+logger = logging.getLogger(__name__)
+
+# 任务类别：交互式导出（编辑等着下载）优先于批量解析/重新提取/多期打包
+INTERACTIVE = 'interactive'
+BULK = 'bulk'
+PRIORITIES = {INTERACTIVE: 0, BULK: 1}
+
+# 还没有运行记录时估算 Retry-After 用的单个任务耗时
+DEFAULT_RUN_SECONDS = 5.0
+MAX_RETRY_AFTER = 300
+
+class SchedulerBusy(RuntimeError):
+    """排队任务数已达上限，retry_after 为建议的重试等待秒数"""
+
+    def __init__(self, job_class: str, depth: int, retry_after: int):
+        super().__init__(f"{job_class} 类任务排队已满（{depth} 个），请 {retry_after} 秒后重试")
+        self.job_class = job_class
+        self.depth = depth
+        self.retry_after = retry_after
+
+class Ticket:
+    """
+    一个任务的调度凭据：受理时创建，可多次申请/归还计算槽（分阶段使用不同数量的工作进程），
+    结束时 finish。queue_wait 为累计等待计算槽的时间，从受理时刻算起
+    """
+
+    def __init__(self, job_class: str, seq: int):
+        self.job_class = job_class
+        self.priority = PRIORITIES[job_class]
+        self.seq = seq
+        self.cost = 1
+        self.state = 'queued'
+        self.submitted_at = time.time()
+        self.queue_wait = 0.0
+        self.run_seconds = 0.0
+        self._waiting_since: Optional[float] = self.submitted_at
+        self._started_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        wait = self.queue_wait
+        if self._waiting_since is not None:
+            wait += time.time() - self._waiting_since
+        return {'jobClass': self.job_class, 'state': self.state,
+                'queueWaitSeconds': round(wait, 3), 'runSeconds': round(self.run_seconds, 3)}
+
+class CpuScheduler:
+    """
+    进程内CPU密集任务的准入控制与优先级调度。
+
+    总共 slots 个计算槽（默认等于CPU核数），任务按占用的工作进程数申请若干个槽；
+    批量类任务最多同时占用 slots - interactive_reserved 个，留出的槽只给交互式导出，
+    批量解析占满时导出仍能立即开始。等待中的任务按 (优先级, 受理顺序) 依次获得计算槽，
+    排在最前的任务槽数不够时后面的也不插队，大任务不会被小任务饿死。
+    每类任务排队数超过 queue_limits 时受理直接失败（SchedulerBusy），由接口返回429。
+    多进程部署时每个工作进程各有一份，计算槽数应按进程数分摊。
+    """
+
+    def __init__(self, slots: int, queue_limits: Dict[str, int], interactive_reserved: int = 0):
+        self.slots = max(1, slots)
+        self.queue_limits = queue_limits
+        self.class_slots = {INTERACTIVE: self.slots,
+                            BULK: max(1, self.slots - max(0, interactive_reserved))}
+        self._cond = threading.Condition()
+        self._seq = 0
+        self._busy = 0
+        self._busy_by_class = {c: 0 for c in PRIORITIES}
+        self._queued = {c: 0 for c in PRIORITIES}
+        self._waiting: List[Ticket] = []
+        self._avg_run = {c: DEFAULT_RUN_SECONDS for c in PRIORITIES}
+
+    def _publish(self) -> None:
+        for job_class, depth in self._queued.items():
+            SCHED_QUEUE_DEPTH.set(depth, job_class=job_class)
+        SCHED_SLOTS_BUSY.set(self._busy)
+
+    def retry_after(self, job_class: str) -> int:
+        """按该类任务的平均耗时和排在前面的任务数估算多久后可能有空位"""
+        ahead = sum(n for c, n in self._queued.items() if PRIORITIES[c] <= PRIORITIES[job_class])
+        estimate = self._avg_run[job_class] * (ahead + 1) / self.class_slots[job_class]
+        return max(1, min(MAX_RETRY_AFTER, math.ceil(estimate)))
+
+    def admit(self, job_class: str, enforce_limit: bool = True) -> Ticket:
+        """受理一个任务，计入排队数；排队已满时抛出 SchedulerBusy。命令行等内部调用可不受上限约束"""
+        with self._cond:
+            depth = self._queued[job_class]
+            limit = self.queue_limits.get(job_class, 0)
+            if enforce_limit and limit and depth >= limit:
+                SCHED_REJECTED.inc(job_class=job_class)
+                retry_after = self.retry_after(job_class)
+                logger.warning(f"{job_class} 类任务排队已满: {depth}/{limit}, 建议 {retry_after}s 后重试")
+                raise SchedulerBusy(job_class, depth, retry_after)
+            self._seq += 1
+            ticket = Ticket(job_class, self._seq)
+            self._queued[job_class] += 1
+            self._publish()
+            return ticket
+
+    def _can_start(self, ticket: Ticket) -> bool:
+        head = min(self._waiting, key=lambda t: (t.priority, t.seq))
+        if head is not ticket:
+            return False
+        return (self._busy + ticket.cost <= self.slots and
+                self._busy_by_class[ticket.job_class] + ticket.cost <= self.class_slots[ticket.job_class])
+
+    @contextmanager
+    def run(self, ticket: Ticket, cost: int = 1) -> Iterator[int]:
+        """
+        等待并占用计算槽，返回实际得到的槽数（申请数不超过该类上限），
+        调用方按这个数决定进程池大小；退出时归还
+        """
+        ticket.cost = max(1, min(cost, self.class_slots[ticket.job_class]))
+        with self._cond:
+            if ticket.state != 'queued':
+                # 分阶段任务的后续阶段重新排队
+                self._queued[ticket.job_class] += 1
+                ticket._waiting_since = time.time()
+                ticket.state = 'queued'
+            self._waiting.append(ticket)
+            try:
+                while not self._can_start(ticket):
+                    self._cond.wait()
+            finally:
+                self._waiting.remove(ticket)
+            now = time.time()
+            ticket.queue_wait += now - ticket._waiting_since
+            ticket._waiting_since = None
+            ticket._started_at = now
+            ticket.state = 'running'
+            self._queued[ticket.job_class] -= 1
+            self._busy += ticket.cost
+            self._busy_by_class[ticket.job_class] += ticket.cost
+            self._publish()
+            # 后面的任务可能也能开始
+            self._cond.notify_all()
+        try:
+            yield ticket.cost
+        finally:
+            with self._cond:
+                ticket.run_seconds += time.time() - ticket._started_at
+                ticket._started_at = None
+                ticket.state = 'paused'
+                self._busy -= ticket.cost
+                self._busy_by_class[ticket.job_class] -= ticket.cost
+                self._publish()
+                self._cond.notify_all()
+
+    def finish(self, ticket: Optional[Ticket]) -> None:
+        """任务结束（或受理后未运行就放弃）：移出排队数，记录等待与运行耗时；可重复调用"""
+        if ticket is None:
+            return
+        with self._cond:
+            if ticket.state == 'done':
+                return
+            if ticket.state == 'queued':
+                self._queued[ticket.job_class] -= 1
+                ticket.queue_wait += time.time() - ticket._waiting_since
+                ticket._waiting_since = None
+            ticket.state = 'done'
+            if ticket.run_seconds:
+                avg = self._avg_run[ticket.job_class]
+                self._avg_run[ticket.job_class] = 0.8 * avg + 0.2 * ticket.run_seconds
+            self._publish()
+        SCHED_QUEUE_WAIT_SECONDS.observe(ticket.queue_wait, job_class=ticket.job_class)
+        SCHED_RUN_SECONDS.observe(ticket.run_seconds, job_class=ticket.job_class)
+
+    @contextmanager
+    def job(self, job_class: str, cost: int = 1) -> Iterator[Ticket]:
+        """受理并运行一个单阶段任务：with scheduler.job(INTERACTIVE) as ticket: ..."""
+        ticket = self.admit(job_class)
+        try:
+            with self.run(ticket, cost):
+                yield ticket
+        finally:
+            self.finish(ticket)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            return {'slots': self.slots, 'busy': self._busy, 'queued': dict(self._queued)}
@@ -0,0 +1,66 @@
+import logging
+from typing import List
+
+from sqlalchemy import inspect, text
+
+logger = logging.getLogger(__name__)
+
+# 建表之后新增的列：(表, 列, 列定义)。db.create_all() 只建缺失的表，不会给已有表加列
+ADDED_COLUMNS = [
+    ('papers', 'offprint_path', 'VARCHAR(500)'),
+    ('papers', 'offprint_pages', 'INTEGER'),
+    ('papers', 'content_hash', 'VARCHAR(40)'),
+    ('file_uploads', 'file_hash', 'VARCHAR(64)'),
+]
+
+# 建表之后新增的索引：(表, 索引名, 列, 是否唯一)。名称与 models.py 中的定义一致
+ADDED_INDEXES = [
+    ('papers', 'uq_paper_doi', 'doi', True),
+    ('file_uploads', 'ix_file_uploads_file_hash', 'file_hash', False),
+]
+
+def _index_names(inspector, table: str) -> set:
+    names = {ix['name'] for ix in inspector.get_indexes(table)}
+    names |= {uc['name'] for uc in inspector.get_unique_constraints(table)}
+    return names
+
+def _dedupe_dois(conn) -> None:
+    """
+    建DOI唯一索引前去掉重复DOI：旧版按文件名去重，改名后的同一文件会被重复解析入库。
+    每个DOI保留id最小（最早导入）的论文，其余论文行保留、只清空DOI，不丢失数据；空字符串DOI改为NULL
+    """
+    conn.execute(text("UPDATE papers SET doi = NULL WHERE doi = ''"))
+    keep = text("SELECT doi, MIN(id) FROM papers WHERE doi IS NOT NULL GROUP BY doi HAVING COUNT(*) > 1")
+    cleared = 0
+    for doi, keep_id in conn.execute(keep).all():
+        cleared += conn.execute(text("UPDATE papers SET doi = NULL WHERE doi = :doi AND id <> :keep_id"),
+                                {'doi': doi, 'keep_id': keep_id}).rowcount
+    if cleared:
+        logger.warning(f"已有数据中存在重复DOI: 清空了 {cleared} 篇重复论文的DOI，每个DOI保留最早导入的一篇")
+
+def upgrade_schema(engine) -> List[str]:
+    """
+    把已部署的数据库升级到当前模型：补齐新增的列和索引，加DOI唯一索引前先去重。
+    幂等，每次启动（init_db）在 create_all 之后执行；返回本次执行的变更。
+    任何一步失败都直接抛出，应用不以与模型不一致的表结构启动
+    """
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    changes = []
+    with engine.begin() as conn:
+        for table, column, ddl in ADDED_COLUMNS:
+            if table not in tables:
+                continue
+            if column not in {c['name'] for c in inspector.get_columns(table)}:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+                changes.append(f"{table}.{column}")
+        for table, name, column, unique in ADDED_INDEXES:
+            if table not in tables or name in _index_names(inspector, table):
+                continue
+            if name == 'uq_paper_doi':
+                _dedupe_dois(conn)
+            conn.execute(text(f"CREATE {'UNIQUE ' if unique else ''}INDEX {name} ON {table} ({column})"))
+            changes.append(f"{table}.{name}")
+    for change in changes:
+        logger.info(f"数据库结构已升级: {change}")
+    return changes
@@ -0,0 +1,285 @@
+import re
+import math
+import time
+import heapq
+import logging
+import threading
+from array import array
+from bisect import bisect_left
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, func, or_, select
+from sqlalchemy.orm import Session
+
+from models import Paper
+
+logger = logging.getLogger(__name__)
+
+# 各字段命中的权重
+FIELD_WEIGHTS = {'title': 3.0, 'authors': 2.0, 'keywords': 2.0, 'doi': 4.0}
+# 查询最后一个英文词按前缀扩展时最多展开的词数
+MAX_PREFIX_EXPANSIONS = 50
+
+_WORD_RE = re.compile(r'[0-9a-z]+|[㐀-䶿一-鿿豈-﫿]+')
+_CJK_RE = re.compile(r'[㐀-䶿一-鿿豈-﫿]')
+_DOI_RE = re.compile(r'^10\.\d{4,9}/\S+$')
+
+def _is_cjk(token: str) -> bool:
+    return _CJK_RE.match(token) is not None
+
+def tokenize(text: str) -> List[str]:
+    """
+    中英文混合分词：英文和数字按单词小写；中文连续片段同时切成单字和相邻二字，
+    无需词典即可匹配任意中文子串（查询时用二字，单字查询用单字）
+    """
+    tokens = []
+    for run in _WORD_RE.findall((text or '').lower()):
+        if _is_cjk(run):
+            tokens.extend(run)
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+def query_terms(text: str) -> List[str]:
+    """查询分词：中文片段只取二字（单字片段取单字），去重并保持顺序"""
+    terms = []
+    for run in _WORD_RE.findall((text or '').lower()):
+        if _is_cjk(run) and len(run) > 1:
+            terms.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            terms.append(run)
+    return list(dict.fromkeys(terms))
+
+def doi_term(doi: str) -> str:
+    """整条DOI作为一个词，精确DOI查询直接命中"""
+    return 'doi:' + doi.strip().lower()
+
+def document_terms(row: Any) -> Dict[str, float]:
+    """一篇论文的 词 → 加权词频"""
+    weights: Dict[str, float] = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        for token in tokenize(getattr(row, field) or ''):
+            weights[token] = weights.get(token, 0.0) + weight
+    if row.doi:
+        weights[doi_term(row.doi)] = FIELD_WEIGHTS['doi']
+    return weights
+
+class PaperSearchIndex:
+    """
+    进程内倒排索引：词 → 按论文id有序的 (id数组, 权重数组)，紧凑存储，10万篇论文约几十MB。
+
+    与数据库的同步：每次查询前（最多每 refresh_interval 秒一次）比较 papers 表的
+    count / max(id) / max(updated_at)，只增量索引新增或修改过的论文（updated_at 只精确到秒，
+    与水位同一秒的论文按内容哈希比较）；
+    数量对不上（有删除）时整体重建。本进程内的提交会立即使索引失效，
+    其他进程（多工作进程部署）写入的数据在 refresh_interval 内可见。
+    """
+
+    def __init__(self, refresh_interval: float = 2.0):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._vocab: List[str] = []          # 有序词表，用于前缀扩展
+        self._doc_terms: Dict[int, List[str]] = {}
+        self._doc_journal: Dict[int, int] = {}
+        self._watermark: Optional[Tuple[int, int, Any]] = None
+        self._boundary: Dict[int, Tuple[Any, int]] = {}
+        self._checked_at = 0.0
+        self._dirty = True
+
+    # ---- 同步 ----
+
+    def invalidate(self) -> None:
+        self._dirty = True
+
+    def attach(self) -> None:
+        """任意会话提交后标记索引待刷新"""
+        event.listen(Session, 'after_commit', lambda session: self.invalidate())
+
+    def refresh(self, session) -> None:
+        now = time.monotonic()
+        if not self._dirty and now - self._checked_at < self.refresh_interval:
+            return
+        with self._lock:
+            self._dirty = False
+            self._checked_at = now
+            watermark = tuple(session.execute(
+                select(func.count(Paper.id), func.coalesce(func.max(Paper.id), 0), func.max(Paper.updated_at))
+            ).one())
+            start = time.perf_counter()
+            if self._watermark is None or watermark[0] < self._watermark[0]:
+                self._rebuild(session)
+                changed = None
+            else:
+                changed = self._sync_changed(session, watermark)
+                if len(self._doc_terms) != watermark[0]:
+                    self._rebuild(session)
+                    changed = None
+            if changed is None:
+                self._boundary = self._boundary_signatures(session, watermark[2])
+            self._watermark = watermark
+            if changed != 0:
+                logger.info(f"搜索索引已同步: {len(self._doc_terms)} 篇论文, {len(self._postings)} 个词, "
+                            f"耗时 {time.perf_counter() - start:.3f}s")
+
+    def _boundary_signatures(self, session, max_updated) -> Dict[int, Tuple[Any, int]]:
+        """水位那一秒内修改过的论文的 (内容哈希, 期刊)"""
+        if max_updated is None:
+            return {}
+        rows = session.execute(select(Paper.id, Paper.content_hash, Paper.journal_id)
+                               .where(Paper.updated_at >= max_updated))
+        return {row.id: (row.content_hash, row.journal_id) for row in rows}
+
+    def _sync_changed(self, session, watermark: Tuple[int, int, Any]) -> int:
+        """
+        增量索引上次水位之后新增或修改过的论文，返回重新索引的篇数。
+        updated_at 只精确到秒（MySQL DATETIME）：与上次水位同一秒内的修改不会抬高 max(updated_at)，
+        所以边界那一秒的论文用 >= 取回，按 (内容哈希, 期刊) 与上次记录的比较，有变化才重新索引
+        """
+        _, max_id, max_updated = self._watermark
+        condition = Paper.id > max_id
+        if max_updated is not None:
+            condition = or_(condition, Paper.updated_at >= max_updated)
+        candidates = session.execute(
+            select(Paper.id, Paper.content_hash, Paper.journal_id, Paper.updated_at).where(condition)).all()
+        changed_ids = [row.id for row in candidates
+                       if row.id > max_id or row.updated_at > max_updated
+                       or self._boundary.get(row.id) != (row.content_hash, row.journal_id)]
+        for k in range(0, len(changed_ids), 500):
+            rows = session.execute(
+                select(Paper.id, Paper.journal_id, Paper.title, Paper.authors, Paper.keywords, Paper.doi)
+                .where(Paper.id.in_(changed_ids[k:k + 500])))
+            for row in rows:
+                self._remove(row.id)
+                self._add(row.id, row.journal_id, document_terms(row))
+        new_max = watermark[2]
+        self._boundary = {row.id: (row.content_hash, row.journal_id) for row in candidates
+                          if new_max is not None and row.updated_at is not None and row.updated_at >= new_max}
+        return len(changed_ids)
+
+    def _rebuild(self, session) -> None:
+        # 先在临时字典中按id顺序追加，最后一次性转成数组
+        ids: Dict[str, List[int]] = {}
+        weights: Dict[str, List[float]] = {}
+        doc_terms: Dict[int, List[str]] = {}
+        doc_journal: Dict[int, int] = {}
+        rows = session.execute(
+            select(Paper.id, Paper.journal_id, Paper.title, Paper.authors, Paper.keywords, Paper.doi)
+            .order_by(Paper.id).execution_options(yield_per=2000))
+        for row in rows:
+            terms = document_terms(row)
+            doc_terms[row.id] = list(terms)
+            doc_journal[row.id] = row.journal_id
+            for term, weight in terms.items():
+                ids.setdefault(term, []).append(row.id)
+                weights.setdefault(term, []).append(weight)
+        self._postings = {t: (array('i', ids[t]), array('f', weights[t])) for t in ids}
+        self._vocab = sorted(self._postings)
+        self._doc_terms = doc_terms
+        self._doc_journal = doc_journal
+
+    def _add(self, paper_id: int, journal_id: int, terms: Dict[str, float]) -> None:
+        for term, weight in terms.items():
+            entry = self._postings.get(term)
+            if entry is None:
+                self._postings[term] = (array('i', [paper_id]), array('f', [weight]))
+                self._vocab.insert(bisect_left(self._vocab, term), term)
+                continue
+            i = bisect_left(entry[0], paper_id)
+            entry[0].insert(i, paper_id)
+            entry[1].insert(i, weight)
+        self._doc_terms[paper_id] = list(terms)
+        self._doc_journal[paper_id] = journal_id
+
+    def _remove(self, paper_id: int) -> None:
+        self._doc_journal.pop(paper_id, None)
+        for term in self._doc_terms.pop(paper_id, ()):
+            ids, weights = self._postings[term]
+            i = bisect_left(ids, paper_id)
+            if i < len(ids) and ids[i] == paper_id:
+                del ids[i]
+                del weights[i]
+            if not ids:
+                del self._postings[term]
+                del self._vocab[bisect_left(self._vocab, term)]
+
+    # ---- 查询 ----
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        i = bisect_left(self._vocab, prefix)
+        terms = []
+        while i < len(self._vocab) and self._vocab[i].startswith(prefix) and len(terms) < MAX_PREFIX_EXPANSIONS:
+            if not self._vocab[i].startswith('doi:'):
+                terms.append(self._vocab[i])
+            i += 1
+        return terms
+
+    def search(self, text: str, offset: int = 0, limit: int = 20,
+               journal_ids: Optional[Iterable[int]] = None) -> Tuple[int, List[Tuple[int, float]]]:
+        """
+        返回 (命中总数, [(论文id, 得分), ...])，按得分降序、id降序。
+        所有查询词都要命中（AND）；最后一个英文词同时按前缀匹配，便于边输入边搜索；
+        整条DOI精确匹配时直接返回该论文
+        """
+        with self._lock:
+            n_docs = len(self._doc_terms) or 1
+            text = (text or '').strip()
+            groups: List[List[str]] = []
+            if _DOI_RE.match(text) and doi_term(text) in self._postings:
+                groups.append([doi_term(text)])
+            else:
+                terms = query_terms(text)
+                for k, term in enumerate(terms):
+                    group = [term] if term in self._postings else []
+                    if k == len(terms) - 1 and not _is_cjk(term) and len(term) >= 2:
+                        group = list(dict.fromkeys(group + self._expand_prefix(term)))
+                    if not group:
+                        return 0, []
+                    groups.append(group)
+            if not groups:
+                return 0, []
+
+            def idf(ids: array) -> float:
+                return math.log(1 + (n_docs - len(ids) + 0.5) / (len(ids) + 0.5))
+
+            # 每组是一个查询词及其前缀扩展，表示为 (id → 权重, 系数)：
+            # 单个词直接用倒排表构造字典（C实现），系数为idf；前缀扩展的多个词组内取最高分，系数为1
+            weighted = []
+            for group in groups:
+                if len(group) == 1:
+                    ids, weights = self._postings[group[0]]
+                    weighted.append((dict(zip(ids, weights)), idf(ids)))
+                    continue
+                merged: Dict[int, float] = {}
+                for term in group:
+                    ids, weights = self._postings[term]
+                    term_idf = idf(ids)
+                    for paper_id, weight in zip(ids, weights):
+                        score = weight * term_idf
+                        if score > merged.get(paper_id, 0.0):
+                            merged[paper_id] = score
+                weighted.append((merged, 1.0))
+
+            # 候选集从最小的一组开始求交（集合运算在C中完成），只对最终候选计算总分
+            weighted.sort(key=lambda item: len(item[0]))
+            candidates = weighted[0][0].keys()
+            for scores, _ in weighted[1:]:
+                candidates = candidates & scores.keys()
+            if journal_ids is not None:
+                allowed = set(journal_ids)
+                candidates = [pid for pid in candidates if self._doc_journal.get(pid) in allowed]
+
+            first, factor = weighted[0]
+            if len(weighted) == 1 and journal_ids is None:
+                # 单个词：排序只取决于权重，直接在倒排字典上取前k
+                top = heapq.nlargest(offset + limit, first.items(), key=itemgetter(1, 0))
+                return len(first), [(pid, weight * factor) for pid, weight in top[offset:offset + limit]]
+
+            totals = {pid: first[pid] * factor for pid in candidates}
+            for scores, factor in weighted[1:]:
+                for pid in totals:
+                    totals[pid] += scores[pid] * factor
+            top = heapq.nlargest(offset + limit, totals.items(), key=itemgetter(1, 0))
+            return len(totals), top[offset:offset + limit]
@@ -0,0 +1,248 @@
+import os
+import sys
+import time
+import hashlib
+import logging
+import argparse
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+from werkzeug.utils import safe_join
+
+from services.export_cache import content_addressed_journal_id
+from services.metrics import STORAGE_BYTES, STORAGE_RECLAIMED_BYTES
+
+logger = logging.getLogger(__name__)
+
+SOURCES = 'sources'
+EXPORTS = 'exports'
+OFFPRINTS = 'offprints'
+INCOMING = 'incoming'
+
+# 刚生成或刚下载的导出产物在这段时间内不淘汰，避免删掉接口刚返回下载地址的文件
+DEFAULT_MIN_IDLE_SECONDS = 300
+# 写了一半的临时文件超过这段时间视为残留
+STALE_TMP_SECONDS = 3600
+
+class UploadStorage:
+    """
+    上传目录管理：
+
+        uploads/sources/<分片>/<存储文件名>     用户上传的源文件，永不自动删除
+        uploads/exports/<分片>/<导出文件名>     生成的目录/统计表，可重新生成，按需淘汰
+        uploads/offprints/<分片>/<抽印本文件名> 从整期PDF拆出的单篇抽印本，论文记录引用其路径，不自动删除
+        uploads/incoming/<会话文件>            进行中的分块上传（不分片，会话数有上限），由上传会话自行过期清理
+
+    分片为键的 SHA-1 前两位十六进制（256个子目录）。源文件和抽印本以文件名为键；
+    导出产物以期刊为键，同一期刊各版本落在同一子目录，方便清理旧版本。
+    导出产物的"最近下载时间"记录在文件 atime 上（显式设置，不依赖挂载选项），
+    不改 mtime，下载接口的 Last-Modified/ETag 保持不变。
+    """
+
+    def __init__(self, root: str, quota_bytes: int = 0, export_max_idle: float = 0,
+                 min_idle: float = DEFAULT_MIN_IDLE_SECONDS):
+        self.root = root
+        self.quota_bytes = quota_bytes
+        self.export_max_idle = export_max_idle
+        self.min_idle = min_idle
+        self.last_report: Optional[Dict[str, Any]] = None
+        self._sweep_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _shard(key: str) -> str:
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()[:2]
+
+    def _dir(self, kind: str, key: str) -> str:
+        path = os.path.join(self.root, kind, self._shard(key))
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def source_path(self, stored_filename: str) -> str:
+        """新上传源文件的保存路径（目录已创建）"""
+        return os.path.join(self._dir(SOURCES, stored_filename), stored_filename)
+
+    def offprint_path(self, filename: str) -> str:
+        """单篇抽印本的保存路径（目录已创建）"""
+        return os.path.join(self._dir(OFFPRINTS, filename), filename)
+
+    def incoming_dir(self) -> str:
+        """分块上传会话目录（已创建），与源文件在同一文件系统，完成时可直接改名"""
+        path = os.path.join(self.root, INCOMING)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def export_dir(self, journal_id: int) -> str:
+        """期刊导出产物所在目录（已创建）"""
+        return self._dir(EXPORTS, f"j{journal_id}")
+
+    def resolve(self, filename: str) -> Optional[str]:
+        """
+        下载文件名 → 实际路径：内容寻址的导出产物、分片源文件、抽印本，
+        最后兼容分片之前直接放在根目录下的旧文件。不存在或文件名越界返回None
+        """
+        candidates = []
+        journal_id = content_addressed_journal_id(filename)
+        if journal_id is not None:
+            candidates.append(safe_join(self.root, EXPORTS, self._shard(f"j{journal_id}"), filename))
+        candidates.append(safe_join(self.root, SOURCES, self._shard(filename), filename))
+        candidates.append(safe_join(self.root, OFFPRINTS, self._shard(filename), filename))
+        candidates.append(safe_join(self.root, filename))
+        for path in candidates:
+            if path is not None and os.path.isfile(path):
+                return path
+        return None
+
+    def touch(self, path: str) -> None:
+        """记录一次下载：只更新 atime"""
+        try:
+            st = os.stat(path)
+            os.utime(path, ns=(time.time_ns(), st.st_mtime_ns))
+        except OSError as e:
+            logger.warning(f"更新访问时间失败: {path}, {str(e)}")
+
+    def _scan(self, kind: str) -> List[Tuple[str, os.stat_result]]:
+        files = []
+        base = os.path.join(self.root, kind)
+        if not os.path.isdir(base):
+            return files
+        for shard in os.scandir(base):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.is_file():
+                    try:
+                        files.append((entry.path, entry.stat()))
+                    except FileNotFoundError:
+                        pass
+        return files
+
+    def _incoming_bytes(self) -> int:
+        base = os.path.join(self.root, INCOMING)
+        total = 0
+        if os.path.isdir(base):
+            for entry in os.scandir(base):
+                try:
+                    total += entry.stat().st_size if entry.is_file() else 0
+                except FileNotFoundError:
+                    pass
+        return total
+
+    def _legacy_files(self) -> List[Tuple[str, os.stat_result]]:
+        """分片之前放在根目录下的文件，只计入用量，不自动删除"""
+        if not os.path.isdir(self.root):
+            return []
+        return [(e.path, e.stat()) for e in os.scandir(self.root) if e.is_file()]
+
+    def _remove(self, path: str, size: int, reason: str, report: Dict[str, Any]) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning(f"删除文件失败: {path}, {str(e)}")
+            return
+        report['evicted'] += 1
+        report['reclaimed_bytes'] += size
+        STORAGE_RECLAIMED_BYTES.inc(size, reason=reason)
+
+    def sweep(self) -> Dict[str, Any]:
+        """
+        清理一次，返回报告：
+        1. 删除残留的临时文件
+        2. 删除超过 export_max_idle 秒未下载的导出产物
+        3. 总用量超过配额时，按最近下载时间从旧到新淘汰导出产物，直到回到配额以内
+        源文件和抽印本从不删除；只淘汰导出产物仍超配额时记录警告
+        """
+        with self._sweep_lock:
+            start = time.time()
+            report = {'evicted': 0, 'reclaimed_bytes': 0, 'over_quota': False}
+            exports = self._scan(EXPORTS)
+            sources = self._scan(SOURCES)
+            offprints = self._scan(OFFPRINTS)
+            legacy = self._legacy_files()
+            incoming_bytes = self._incoming_bytes()
+
+            kept = []
+            for path, st in exports:
+                idle = start - st.st_atime
+                if path.endswith('.tmp'):
+                    if start - st.st_mtime > STALE_TMP_SECONDS:
+                        self._remove(path, st.st_size, 'stale_tmp', report)
+                    continue
+                if self.export_max_idle and idle > self.export_max_idle:
+                    self._remove(path, st.st_size, 'idle', report)
+                    continue
+                kept.append((path, st))
+
+            sources_bytes = sum(st.st_size for _, st in sources)
+            offprints_bytes = sum(st.st_size for _, st in offprints)
+            legacy_bytes = sum(st.st_size for _, st in legacy)
+            exports_bytes = sum(st.st_size for _, st in kept)
+            total = sources_bytes + legacy_bytes + offprints_bytes + exports_bytes + incoming_bytes
+
+            if self.quota_bytes and total > self.quota_bytes:
+                # 最近下载时间最早的先淘汰
+                for path, st in sorted(kept, key=lambda item: item[1].st_atime):
+                    if total <= self.quota_bytes:
+                        break
+                    if start - st.st_atime < self.min_idle:
+                        continue
+                    self._remove(path, st.st_size, 'quota', report)
+                    total -= st.st_size
+                    exports_bytes -= st.st_size
+                if total > self.quota_bytes:
+                    report['over_quota'] = True
+                    logger.warning(f"上传目录用量 {total} 字节超过配额 {self.quota_bytes}，源文件不会被自动删除")
+
+            STORAGE_BYTES.set(sources_bytes + legacy_bytes, kind='sources')
+            STORAGE_BYTES.set(offprints_bytes, kind='offprints')
+            STORAGE_BYTES.set(exports_bytes, kind='exports')
+            STORAGE_BYTES.set(incoming_bytes, kind='incoming')
+            report.update({
+                'sources_bytes': sources_bytes + legacy_bytes,
+                'offprints_bytes': offprints_bytes,
+                'exports_bytes': exports_bytes,
+                'incoming_bytes': incoming_bytes,
+                'quota_bytes': self.quota_bytes,
+                'finished_at': time.time(),
+                'duration': time.time() - start,
+            })
+            self.last_report = report
+            logger.info(f"存储清理完成: 淘汰 {report['evicted']} 个文件, 回收 {report['reclaimed_bytes']} 字节, "
+                        f"源文件 {report['sources_bytes']} 字节, 导出产物 {report['exports_bytes']} 字节")
+            return report
+
+    def start_sweeper(self, interval: float) -> None:
+        """启动后台定期清理线程（守护线程，进程退出时随之结束）"""
+        if self._thread is not None:
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.sweep()
+                except Exception as e:
+                    logger.error(f"存储清理失败: {str(e)}")
+
+        self._thread = threading.Thread(target=run, name='storage-sweeper', daemon=True)
+        self._thread.start()
+
+    def stop_sweeper(self) -> None:
+        self._stop.set()
+
+def main():
+    parser = argparse.ArgumentParser(description='清理上传目录中的导出产物（源文件不会被删除）')
+    parser.add_argument('root', nargs='?', default='uploads', help='上传目录')
+    parser.add_argument('--quota-mb', type=int, default=0, help='总用量配额(MB)，0 表示不限')
+    parser.add_argument('--max-idle-days', type=float, default=0,
+                        help='删除超过该天数未下载的导出产物，0 表示只按配额淘汰')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    storage = UploadStorage(args.root, args.quota_mb * 1024 * 1024, args.max_idle_days * 86400, min_idle=0)
+    report = storage.sweep()
+    print(f"回收 {report['reclaimed_bytes']} 字节（{report['evicted']} 个文件）", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,6 @@
 @echo off
-cd /d %~dp0backend\uploads
-del /q *.* 2>nul
-rmdir /s /q excel 2>nul
-rmdir /s /q pdfs 2>nul
-rmdir /s /q weibo 2>nul
+rem Remove generated exports not downloaded for 7 days and leftover temp files.
+rem Uploaded source PDFs are kept; the backend also runs this sweep periodically.
+cd /d %~dp0backend
+python -m services.storage uploads --max-idle-days 7
 echo Uploads directory cleaned
\ No newline at end of file